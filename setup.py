@@ -54,6 +54,7 @@ setup(
             "pytest-asyncio>=0.21.0",
             "pytest-mock>=3.10.0",
             "requests-mock>=1.10.0",
+            "pytest-xdist>=3.0.0",
         ],
     },
     entry_points={
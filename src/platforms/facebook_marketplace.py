@@ -93,7 +93,7 @@ class FacebookMarketplacePlatform(PlatformBase):
             self.logger.log_error(e, {"operation": "authenticate", "platform": "facebook_marketplace"})
             return False
     
-    @retry_on_failure(RetryConfig(max_retries=3, backoff_factor=2))
+    @retry_on_failure(RetryConfig(max_retries=3, backoff_factor=2, idempotent=False))
     def list_item(self, listing_data: ListingData) -> str:
         """Create a new listing on Facebook Marketplace"""
         if not self.authenticated:
@@ -87,7 +87,7 @@ class MercariPlatform(PlatformBase):
             self.logger.log_error(e, {"operation": "authenticate", "platform": "mercari"})
             return False
     
-    @retry_on_failure(RetryConfig(max_retries=3, backoff_factor=2))
+    @retry_on_failure(RetryConfig(max_retries=3, backoff_factor=2, idempotent=False))
     def list_item(self, listing_data: ListingData) -> str:
         """Create a new listing on Mercari"""
         if not self.authenticated:
@@ -1,4 +1,5 @@
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import json
 from typing import Dict, Any, List, Optional
@@ -45,6 +46,10 @@ class VintedPlatform(PlatformBase):
         # API URLs
         self.base_url = "https://api.vinted.com/v1"
         
+        # Pooled session so API calls reuse TCP/TLS connections
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        
         # Condition mapping (Vinted has specific conditions)
         self.condition_mapping = {
             'New': 'brand_new_with_tag',
@@ -100,7 +105,7 @@ class VintedPlatform(PlatformBase):
             headers.update(self.oauth_manager.get_authorization_header())
             
             start_time = time.time()
-            response = requests.get(
+            response = self._session.get(
                 f"{self.base_url}/user/profile",
                 headers=headers,
                 timeout=30
@@ -132,7 +137,7 @@ class VintedPlatform(PlatformBase):
             self.logger.log_error(e, {"operation": "authenticate", "platform": "vinted"})
             return False
     
-    @retry_on_failure(RetryConfig(max_retries=3, backoff_factor=2))
+    @retry_on_failure(RetryConfig(max_retries=3, backoff_factor=2, idempotent=False))
     def list_item(self, listing_data: ListingData) -> str:
         """Create a new listing on Vinted"""
         if not self.authenticated:
@@ -177,7 +182,7 @@ class VintedPlatform(PlatformBase):
             payload = {k: v for k, v in payload.items() if v is not None}
             
             start_time = time.time()
-            response = requests.post(
+            response = self._session.post(
                 f"{self.base_url}/items",
                 json=payload,
                 headers=headers,
@@ -253,7 +258,7 @@ class VintedPlatform(PlatformBase):
         """Upload a single photo to Vinted"""
         try:
             # Download photo
-            photo_response = requests.get(photo_url, timeout=30)
+            photo_response = self._session.get(photo_url, timeout=30)
             if photo_response.status_code != 200:
                 raise Exception(f"Failed to download photo from {photo_url}")
             
@@ -269,7 +274,7 @@ class VintedPlatform(PlatformBase):
             }
             
             start_time = time.time()
-            response = requests.post(
+            response = self._session.post(
                 f"{self.base_url}/photos",
                 files=files,
                 headers=headers,
@@ -321,7 +326,7 @@ class VintedPlatform(PlatformBase):
             payload = {k: v for k, v in payload.items() if v is not None}
             
             start_time = time.time()
-            response = requests.put(
+            response = self._session.put(
                 f"{self.base_url}/items/{listing_id}",
                 json=payload,
                 headers=headers,
@@ -387,7 +392,7 @@ class VintedPlatform(PlatformBase):
             headers.update(self.oauth_manager.get_authorization_header())
             
             start_time = time.time()
-            response = requests.delete(
+            response = self._session.delete(
                 f"{self.base_url}/items/{listing_id}",
                 headers=headers,
                 timeout=30
@@ -441,7 +446,7 @@ class VintedPlatform(PlatformBase):
                 params.update(filters)
             
             start_time = time.time()
-            response = requests.get(
+            response = self._session.get(
                 f"{self.base_url}/items",
                 headers=headers,
                 params=params,
@@ -515,7 +520,7 @@ class VintedPlatform(PlatformBase):
                 params['created_at_to'] = date_range[1].isoformat()
             
             start_time = time.time()
-            response = requests.get(
+            response = self._session.get(
                 f"{self.base_url}/transactions",
                 headers=headers,
                 params=params,
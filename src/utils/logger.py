@@ -2,21 +2,146 @@ import logging
 import logging.handlers
 import json
 import os
+import re
+import queue
+import atexit
+import copy
+import threading
+import time
+import traceback
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Union
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    # Fall back to the standard library encoder
+    orjson = None
+
+
+def _dumps(obj: Dict[str, Any]) -> str:
+    """Serialize a log entry, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj)
+
+
+# Size strings such as '10MB', '512 kb' or '2048'
+_SIZE_RE = re.compile(r'^\s*(\d+)\s*([KMG]?B)?\s*$', re.IGNORECASE)
+_SIZE_MULTIPLIERS = {'B': 1, 'KB': 1 << 10, 'MB': 1 << 20, 'GB': 1 << 30}
+
+
+def _parse_size(size: Union[str, int]) -> int:
+    """Parse size string like '10MB' to bytes"""
+    if isinstance(size, int):
+        return size
+    
+    match = _SIZE_RE.match(size)
+    if not match:
+        raise ValueError(f"Invalid size: {size!r}")
+    
+    return int(match.group(1)) * _SIZE_MULTIPLIERS[(match.group(2) or 'B').upper()]
+
+
+# Query parameter name endings masked by _sanitize_url (covers access_token, client_secret, ...)
+_SENSITIVE_PARAM_SUFFIXES = ('api_key', 'token', 'secret', 'password')
+
+# Last whole second formatted by _iso_seconds and its ISO string
+_timestamp_cache = (0, '')
+
+
+def _iso_seconds(second: int) -> str:
+    """ISO string for an epoch second, formatted at most once per second"""
+    global _timestamp_cache
+    
+    cached_second, cached_iso = _timestamp_cache
+    if second != cached_second:
+        cached_iso = datetime.fromtimestamp(second).isoformat()
+        _timestamp_cache = (second, cached_iso)
+    return cached_iso
+
+
+# Active queue listeners keyed by logger name
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
+# StructuredLogger instances shared by get_logger, keyed by logger name
+_loggers: Dict[str, 'StructuredLogger'] = {}
+_loggers_lock = threading.Lock()
+
+
+def _stop_listener(name: str) -> None:
+    """Stop the queue listener registered for a logger, if any
+    
+    Listeners are registered only once started and removed here before
+    stopping, so each one is stopped exactly once.
+    """
+    listener = _listeners.pop(name, None)
+    if listener is None:
+        return
+    
+    listener.stop()
+    
+    for handler in listener.handlers:
+        handler.close()
+
+
+@atexit.register
+def _stop_all_listeners() -> None:
+    """Flush pending records on interpreter shutdown"""
+    for name in list(_listeners):
+        _stop_listener(name)
+
+
+class TokenBucket:
+    """Token bucket limiting how many events may pass per second"""
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def consume(self, tokens: float = 1) -> bool:
+        """Take tokens from the bucket, returning False if not enough are left"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            
+            if self._tokens < tokens:
+                return False
+            
+            self._tokens -= tokens
+            return True
+
 
 class StructuredLogger:
     """Structured logging utility with JSON formatting and rotation"""
     
+    DUPLICATE_CACHE_SIZE = 256
+    
     def __init__(self, name: str, config: Dict[str, Any] = None):
         self.logger = logging.getLogger(name)
         self.config = config or {}
+        
+        # Optional throttling for high-volume success logs
+        max_logs_per_sec = self.config.get('max_logs_per_sec')
+        self._bucket = TokenBucket(rate=max_logs_per_sec) if max_logs_per_sec else None
+        self._suppress_duplicates = self.config.get('suppress_duplicates', False)
+        self._duplicate_window = self.config.get('duplicate_window', 5.0)
+        self._dup_cache: OrderedDict = OrderedDict()
+        self._dup_lock = threading.Lock()
+        
         self._setup_logger()
     
     def _setup_logger(self):
-        """Setup logger with handlers and formatting"""
+        """Setup logger with a queue handler feeding a background listener"""
+        # Stop any listener left over from a previous setup of this logger
+        _stop_listener(self.logger.name)
+        
         # Clear existing handlers
         self.logger.handlers.clear()
         
@@ -26,7 +151,7 @@ class StructuredLogger:
         # Console handler
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(self._get_console_formatter())
-        self.logger.addHandler(console_handler)
+        handlers = [console_handler]
         
         # File handler with rotation
         log_file = self.config.get('file', 'logs/cross_listing.log')
@@ -34,13 +159,35 @@ class StructuredLogger:
             log_path = Path(log_file)
             log_path.parent.mkdir(parents=True, exist_ok=True)
             
-            file_handler = logging.handlers.RotatingFileHandler(
+            file_handler = BufferedRotatingFileHandler(
                 log_file,
-                maxBytes=self._parse_size(self.config.get('max_file_size', '10MB')),
-                backupCount=self.config.get('backup_count', 5)
+                maxBytes=_parse_size(self.config.get('max_file_size', '10MB')),
+                backupCount=self.config.get('backup_count', 5),
+                buffer_size=self.config.get('flush_buffer_size', 65536),
+                flush_interval=self.config.get('flush_interval', 0.2)
             )
             file_handler.setFormatter(self._get_file_formatter())
-            self.logger.addHandler(file_handler)
+            handlers.append(file_handler)
+        
+        # Callers only enqueue records; the listener thread does the actual I/O
+        self._log_queue = queue.Queue(maxsize=self.config.get('queue_size', 10000))
+        self.logger.addHandler(DeferredQueueHandler(self._log_queue))
+        
+        self._listener = logging.handlers.QueueListener(
+            self._log_queue, *handlers, respect_handler_level=True
+        )
+        self._listener.start()
+        _listeners[self.logger.name] = self._listener
+    
+    @property
+    def is_running(self) -> bool:
+        """Whether this logger's background listener is still active"""
+        return _listeners.get(self.logger.name) is self._listener
+    
+    def close(self):
+        """Stop the background listener, flushing any pending records"""
+        if self.is_running:
+            _stop_listener(self.logger.name)
     
     def _get_console_formatter(self):
         """Get console formatter"""
@@ -53,23 +200,40 @@ class StructuredLogger:
         """Get file formatter with JSON structure"""
         return JsonFormatter()
     
-    def _parse_size(self, size_str: str) -> int:
-        """Parse size string like '10MB' to bytes"""
-        size_str = size_str.upper()
-        if size_str.endswith('KB'):
-            return int(size_str[:-2]) * 1024
-        elif size_str.endswith('MB'):
-            return int(size_str[:-2]) * 1024 * 1024
-        elif size_str.endswith('GB'):
-            return int(size_str[:-2]) * 1024 * 1024 * 1024
-        else:
-            return int(size_str)
+    def _should_log_success(self, key: tuple) -> bool:
+        """Rate limit and de-duplicate success records; failures always pass"""
+        if not self._suppress_duplicates:
+            return self._bucket is None or self._bucket.consume()
+        
+        now = time.monotonic()
+        with self._dup_lock:
+            last_seen = self._dup_cache.get(key)
+            if last_seen is not None and now - last_seen < self._duplicate_window:
+                return False
+            
+            # Only mark the key as seen once the record is actually emitted
+            if self._bucket is not None and not self._bucket.consume():
+                return False
+            
+            self._dup_cache[key] = now
+            self._dup_cache.move_to_end(key)
+            if len(self._dup_cache) > self.DUPLICATE_CACHE_SIZE:
+                self._dup_cache.popitem(last=False)
+        
+        return True
     
     def log_api_call(self, platform: str, method: str, url: str, 
                      duration: float, success: bool, 
                      status_code: Optional[int] = None, 
                      error: Optional[str] = None):
         """Log API call with structured data"""
+        level = logging.INFO if success else logging.ERROR
+        if not self.logger.isEnabledFor(level):
+            return
+        
+        if success and not self._should_log_success(("api_call", platform, method, status_code)):
+            return
+        
         log_data = {
             "event_type": "api_call",
             "platform": platform,
@@ -77,91 +241,92 @@ class StructuredLogger:
             "url": self._sanitize_url(url),
             "duration": round(duration, 3),
             "success": success,
-            "status_code": status_code,
-            "timestamp": datetime.now().isoformat()
+            "status_code": status_code
         }
         
         if error:
             log_data["error"] = str(error)
         
-        message = f"API call to {platform} {method} - {'SUCCESS' if success else 'FAILED'}"
-        
-        if success:
-            self.logger.info(message, extra={"structured_data": log_data})
-        else:
-            self.logger.error(message, extra={"structured_data": log_data})
+        self.logger.log(level, "API call to %s %s - %s", platform, method,
+                        'SUCCESS' if success else 'FAILED', extra={"structured_data": log_data})
     
     def log_listing_operation(self, operation: str, platform: str, 
                               item_id: str, listing_id: Optional[str] = None,
                               success: bool = True, error: Optional[str] = None):
         """Log listing operations"""
+        level = logging.INFO if success else logging.ERROR
+        if not self.logger.isEnabledFor(level):
+            return
+        
+        if success and not self._should_log_success(
+                ("listing_operation", operation, platform, item_id, listing_id)):
+            return
+        
         log_data = {
             "event_type": "listing_operation",
             "operation": operation,
             "platform": platform,
             "item_id": item_id,
             "listing_id": listing_id,
-            "success": success,
-            "timestamp": datetime.now().isoformat()
+            "success": success
         }
         
         if error:
             log_data["error"] = str(error)
         
-        message = f"Listing {operation} for {item_id} on {platform} - {'SUCCESS' if success else 'FAILED'}"
-        
-        if success:
-            self.logger.info(message, extra={"structured_data": log_data})
-        else:
-            self.logger.error(message, extra={"structured_data": log_data})
+        self.logger.log(level, "Listing %s for %s on %s - %s", operation, item_id, platform,
+                        'SUCCESS' if success else 'FAILED', extra={"structured_data": log_data})
     
     def log_sync_operation(self, operation: str, platform: str, 
                            items_processed: int, items_failed: int = 0,
                            duration: Optional[float] = None):
         """Log synchronization operations"""
+        level = logging.INFO if items_failed == 0 else logging.WARNING
+        if not self.logger.isEnabledFor(level):
+            return
+        
         log_data = {
             "event_type": "sync_operation",
             "operation": operation,
             "platform": platform,
             "items_processed": items_processed,
             "items_failed": items_failed,
-            "success_rate": (items_processed - items_failed) / items_processed if items_processed > 0 else 0,
-            "timestamp": datetime.now().isoformat()
+            "success_rate": (items_processed - items_failed) / items_processed if items_processed > 0 else 0
         }
         
         if duration:
             log_data["duration"] = round(duration, 3)
         
-        message = f"Sync {operation} for {platform} - {items_processed} items processed, {items_failed} failed"
-        
-        if items_failed == 0:
-            self.logger.info(message, extra={"structured_data": log_data})
-        else:
-            self.logger.warning(message, extra={"structured_data": log_data})
+        self.logger.log(level, "Sync %s for %s - %s items processed, %s failed", operation, platform,
+                        items_processed, items_failed, extra={"structured_data": log_data})
     
     def log_error(self, error: Exception, context: Dict[str, Any] = None):
         """Log error with context"""
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
+        
         log_data = {
             "event_type": "error",
             "error_type": type(error).__name__,
-            "error_message": str(error),
-            "timestamp": datetime.now().isoformat()
+            "error_message": str(error)
         }
         
         if context:
             log_data["context"] = context
         
-        self.logger.error(f"Error: {error}", extra={"structured_data": log_data})
+        self.logger.error("Error: %s", error, extra={"structured_data": log_data})
     
     def log_performance(self, operation: str, duration: float, 
                         items_count: Optional[int] = None,
                         platform: Optional[str] = None):
         """Log performance metrics"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         log_data = {
             "event_type": "performance",
             "operation": operation,
-            "duration": round(duration, 3),
-            "timestamp": datetime.now().isoformat()
+            "duration": round(duration, 3)
         }
         
         if items_count:
@@ -171,31 +336,208 @@ class StructuredLogger:
         if platform:
             log_data["platform"] = platform
         
-        message = f"Performance: {operation} took {duration:.3f}s"
         if items_count:
-            message += f" for {items_count} items"
-        
-        self.logger.info(message, extra={"structured_data": log_data})
+            self.logger.info("Performance: %s took %.3fs for %s items", operation, duration, items_count,
+                             extra={"structured_data": log_data})
+        else:
+            self.logger.info("Performance: %s took %.3fs", operation, duration,
+                             extra={"structured_data": log_data})
     
     def _sanitize_url(self, url: str) -> str:
         """Remove sensitive information from URLs"""
-        import re
-        # Remove API keys, tokens, and other sensitive query parameters
-        sensitive_params = ['api_key', 'token', 'access_token', 'secret', 'password']
+        # Fast paths: no query string, or no sensitive name anywhere in the URL
+        if '?' not in url:
+            return url
+        
+        lowered = url.lower()
+        if not any(name in lowered for name in _SENSITIVE_PARAM_SUFFIXES):
+            return url
+        
+        base, _, query = url.partition('?')
+        query, hash_sep, fragment = query.partition('#')
+        
+        # Remove API keys, tokens, and other sensitive query parameters in one pass
+        params = []
+        for pair in query.split('&'):
+            key, eq, _ = pair.partition('=')
+            if eq and key.lower().endswith(_SENSITIVE_PARAM_SUFFIXES):
+                pair = key + '=***'
+            params.append(pair)
+        
+        return f"{base}?{'&'.join(params)}{hash_sep}{fragment}"
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves record formatting to the listener thread
+    
+    The stock QueueHandler renders the whole record, exception text included,
+    on the calling thread. Here only the message and structured fields are
+    snapshotted before the record is queued, so later changes to the caller's
+    arguments do not leak into the log; JSON encoding happens on the listener.
+    """
+    
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        
+        structured_data = getattr(record, 'structured_data', None)
+        if structured_data:
+            record.structured_data = copy.deepcopy(structured_data)
+        
+        return record
+
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that double-buffers records for a writer thread
+    
+    emit() only appends encoded records to the filling buffer. A dedicated
+    writer thread sleeps until the first record arrives, then swaps the
+    buffers once buffer_size bytes are held or flush_interval seconds have
+    passed since that record, and writes the batch with a single call, so
+    the caller never waits on disk I/O.
+    """
+    
+    def __init__(self, filename: str, maxBytes: int = 0, backupCount: int = 0,
+                 buffer_size: int = 65536, flush_interval: float = 0.2,
+                 encoding: Optional[str] = 'utf-8'):
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        
+        self._filling = bytearray()
+        self._spare = bytearray()
+        # Offsets into the filling buffer at which the file must be rotated
+        self._rollover_offsets: List[int] = []
+        # When the oldest record still in the filling buffer was added
+        self._first_write = 0.0
+        self._buffer_cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._closing = False
+        
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding)
+        
+        # Size of the current file including records still in the buffers
+        self._bytes_written = os.path.getsize(self.baseFilename) if os.path.exists(self.baseFilename) else 0
+        
+        self._writer_thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer_thread.start()
+    
+    def _open(self):
+        """Open the log file for binary appends"""
+        return open(self.baseFilename, 'ab')
+    
+    def emit(self, record):
+        """Append a record to the filling buffer"""
+        try:
+            data = (self.format(record) + self.terminator).encode(
+                self.encoding or 'utf-8', getattr(self, 'errors', None) or 'strict'
+            )
+            
+            with self._buffer_cond:
+                if self.maxBytes > 0 and self._bytes_written and \
+                        self._bytes_written + len(data) >= self.maxBytes:
+                    self._rollover_offsets.append(len(self._filling))
+                    self._bytes_written = 0
+                
+                if not self._filling:
+                    self._first_write = time.monotonic()
+                    self._buffer_cond.notify()
+                
+                self._filling += data
+                self._bytes_written += len(data)
+                
+                if len(self._filling) >= self.buffer_size:
+                    self._buffer_cond.notify()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def flush(self):
+        """Write all buffered records to disk"""
+        self._drain()
+    
+    def close(self):
+        """Write remaining records, stop the writer thread and close the file"""
+        with self._buffer_cond:
+            self._closing = True
+            self._buffer_cond.notify()
         
-        for param in sensitive_params:
-            pattern = f'({param}=)[^&]*'
-            url = re.sub(pattern, r'\1***', url, flags=re.IGNORECASE)
+        if self._writer_thread.is_alive() and self._writer_thread is not threading.current_thread():
+            self._writer_thread.join()
         
-        return url
+        super().close()
+    
+    def _write_loop(self):
+        """Writer thread: flush once a buffer fills or its oldest record is flush_interval old"""
+        while True:
+            with self._buffer_cond:
+                # Idle without polling until a record is buffered
+                while not self._closing and not self._filling:
+                    self._buffer_cond.wait()
+                
+                while not self._closing and len(self._filling) < self.buffer_size:
+                    remaining = self._first_write + self.flush_interval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._buffer_cond.wait(remaining)
+                closing = self._closing
+            
+            try:
+                self._drain()
+            except Exception:
+                if logging.raiseExceptions:
+                    traceback.print_exc()
+            
+            if closing:
+                return
+    
+    def _drain(self):
+        """Swap buffers and write the full one, rotating where required"""
+        with self._write_lock:
+            with self._buffer_cond:
+                if not self._filling and not self._rollover_offsets:
+                    return
+                
+                data, offsets = self._filling, self._rollover_offsets
+                self._filling, self._rollover_offsets = self._spare, []
+            
+            # Producers keep filling the other buffer while this one is written
+            view = memoryview(data)
+            try:
+                start = 0
+                for offset in offsets:
+                    if self.stream is None:
+                        self.stream = self._open()
+                    self.stream.write(view[start:offset])
+                    self.doRollover()
+                    start = offset
+                
+                if self.stream is None:
+                    self.stream = self._open()
+                self.stream.write(view[start:])
+                self.stream.flush()
+            finally:
+                view.release()
+                data.clear()
+                self._spare = data
 
 
 class JsonFormatter(logging.Formatter):
     """JSON formatter for structured logging"""
     
     def format(self, record):
+        # Reuse the cached whole-second prefix and only append microseconds
+        second = int(record.created)
+        microsecond = round((record.created - second) * 1000000)
+        if microsecond == 1000000:
+            second, microsecond = second + 1, 0
+        timestamp = _iso_seconds(second)
+        if microsecond:
+            timestamp = f"{timestamp}.{microsecond:06d}"
+        
         log_entry = {
-            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "timestamp": timestamp,
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -205,14 +547,15 @@ class JsonFormatter(logging.Formatter):
         }
         
         # Add structured data if available
-        if hasattr(record, 'structured_data'):
-            log_entry.update(record.structured_data)
+        structured_data = getattr(record, 'structured_data', None)
+        if structured_data:
+            log_entry.update(structured_data)
         
         # Add exception info if available
         if record.exc_info:
             log_entry["exception"] = self.formatException(record.exc_info)
         
-        return json.dumps(log_entry)
+        return _dumps(log_entry)
 
 
 def setup_logging(config: Dict[str, Any] = None) -> StructuredLogger:
@@ -225,9 +568,22 @@ def setup_logging(config: Dict[str, Any] = None) -> StructuredLogger:
             'backup_count': 5
         }
     
-    return StructuredLogger("cross_listing", config)
+    logger = StructuredLogger("cross_listing", config)
+    
+    with _loggers_lock:
+        _loggers[logger.logger.name] = logger
+    
+    return logger
 
 
 def get_logger(name: str) -> StructuredLogger:
-    """Get a logger instance"""
-    return StructuredLogger(name)
\ No newline at end of file
+    """Get a logger instance, reusing the existing one for this name"""
+    with _loggers_lock:
+        logger = _loggers.get(name)
+        
+        # Rebuild if the cached logger was closed or replaced by a newer setup
+        if logger is None or not logger.is_running:
+            logger = StructuredLogger(name)
+            _loggers[name] = logger
+        
+        return logger
\ No newline at end of file
@@ -1,9 +1,11 @@
 import requests
+from requests.adapters import HTTPAdapter
 import time
-import json
-from typing import Dict, Any, Optional, Tuple
+import threading
+import hmac
+from typing import Dict, Any, Optional, Tuple, Union
 from datetime import datetime, timedelta
-import logging
+from urllib.parse import urlencode, quote
 
 from .logger import get_logger
 from .retry import retry_on_failure, RetryConfig
@@ -12,6 +14,12 @@ from .retry import retry_on_failure, RetryConfig
 class OAuthTokenManager:
     """OAuth 2.0 token management with automatic refresh"""
     
+    # Headers for form-encoded token endpoint requests
+    FORM_HEADERS = {
+        'Content-Type': 'application/x-www-form-urlencoded',
+        'Accept': 'application/json'
+    }
+    
     def __init__(self, client_id: str, client_secret: str, 
                  token_endpoint: str, config: Dict[str, Any] = None):
         self.client_id = client_id
@@ -21,15 +29,46 @@ class OAuthTokenManager:
         
         self.logger = get_logger(self.__class__.__name__)
         
+        # Pooled session so token requests reuse TCP/TLS connections
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        
         # Token storage
         self.access_token: Optional[str] = None
         self.refresh_token: Optional[str] = None
-        self.expires_at: Optional[datetime] = None
+        self.expires_at = None
         self.token_type: str = "Bearer"
         
         # Token refresh settings
         self.refresh_threshold_seconds = self.config.get('refresh_threshold_seconds', 300)  # 5 minutes
         self.max_refresh_retries = self.config.get('max_refresh_retries', 3)
+        
+        # Only one caller refreshes at a time; others reuse the new token
+        self._refresh_lock = threading.Lock()
+        
+        # Authorization header cached for the current (token_type, token) pair
+        self._auth_header_key: Optional[Tuple[str, str]] = None
+        self._auth_header: Dict[str, str] = {}
+    
+    @property
+    def expires_at(self) -> Optional[datetime]:
+        """Wall-clock expiry time of the access token"""
+        return self._expires_at
+    
+    @expires_at.setter
+    def expires_at(self, value: Optional[datetime]) -> None:
+        self._expires_at = value
+        
+        # Expiry checks compare against a monotonic deadline instead of datetimes
+        if value is None:
+            self._expires_at_monotonic = None
+        else:
+            self._expires_at_monotonic = time.monotonic() + (value - datetime.now()).total_seconds()
+    
+    def _set_expires_in(self, expires_in: float) -> None:
+        """Set token expiry relative to now"""
+        self._expires_at = datetime.now() + timedelta(seconds=expires_in)
+        self._expires_at_monotonic = time.monotonic() + expires_in
     
     def initialize_tokens(self, access_token: str, refresh_token: str, 
                          expires_in: Optional[int] = None) -> None:
@@ -38,7 +77,7 @@ class OAuthTokenManager:
         self.refresh_token = refresh_token
         
         if expires_in:
-            self.expires_at = datetime.now() + timedelta(seconds=expires_in)
+            self._set_expires_in(expires_in)
         
         self.logger.logger.info("OAuth tokens initialized")
     
@@ -49,22 +88,24 @@ class OAuthTokenManager:
             return None
         
         if self._should_refresh_token():
-            try:
-                self._refresh_access_token()
-            except Exception as e:
-                self.logger.log_error(e, {"operation": "token_refresh"})
-                return None
+            with self._refresh_lock:
+                # Another thread may have refreshed while we waited for the lock
+                if self._should_refresh_token():
+                    try:
+                        self._refresh_access_token()
+                    except Exception as e:
+                        self.logger.log_error(e, {"operation": "token_refresh"})
+                        return None
         
         return self.access_token
     
     def _should_refresh_token(self) -> bool:
         """Check if token should be refreshed"""
-        if not self.expires_at or not self.refresh_token:
+        if self._expires_at_monotonic is None or not self.refresh_token:
             return False
         
         # Refresh if token expires within threshold
-        time_until_expiry = (self.expires_at - datetime.now()).total_seconds()
-        return time_until_expiry <= self.refresh_threshold_seconds
+        return self._expires_at_monotonic - time.monotonic() <= self.refresh_threshold_seconds
     
     @retry_on_failure(RetryConfig(max_retries=3, backoff_factor=2))
     def _refresh_access_token(self) -> None:
@@ -72,11 +113,6 @@ class OAuthTokenManager:
         if not self.refresh_token:
             raise Exception("No refresh token available")
         
-        headers = {
-            'Content-Type': 'application/x-www-form-urlencoded',
-            'Accept': 'application/json'
-        }
-        
         data = {
             'grant_type': 'refresh_token',
             'refresh_token': self.refresh_token,
@@ -87,9 +123,9 @@ class OAuthTokenManager:
         self.logger.logger.info("Refreshing OAuth access token")
         
         start_time = time.time()
-        response = requests.post(
+        response = self._session.post(
             self.token_endpoint,
-            headers=headers,
+            headers=self.FORM_HEADERS,
             data=data,
             timeout=30
         )
@@ -116,7 +152,7 @@ class OAuthTokenManager:
             
             expires_in = token_data.get('expires_in')
             if expires_in:
-                self.expires_at = datetime.now() + timedelta(seconds=expires_in)
+                self._set_expires_in(expires_in)
             
             self.logger.logger.info("OAuth token refreshed successfully")
         else:
@@ -130,7 +166,12 @@ class OAuthTokenManager:
         if not token:
             raise Exception("No valid access token available")
         
-        return {'Authorization': f'{self.token_type} {token}'}
+        key = (self.token_type, token)
+        if key != self._auth_header_key:
+            self._auth_header = {'Authorization': f'{self.token_type} {token}'}
+            self._auth_header_key = key
+        
+        return self._auth_header
     
     def revoke_tokens(self) -> bool:
         """Revoke current tokens"""
@@ -138,11 +179,6 @@ class OAuthTokenManager:
             return True
         
         try:
-            headers = {
-                'Content-Type': 'application/x-www-form-urlencoded',
-                'Accept': 'application/json'
-            }
-            
             data = {
                 'token': self.access_token,
                 'token_type_hint': 'access_token',
@@ -152,7 +188,7 @@ class OAuthTokenManager:
             
             # Note: Not all OAuth providers support token revocation
             revoke_endpoint = self.token_endpoint.replace('/token', '/revoke')
-            response = requests.post(revoke_endpoint, headers=headers, data=data, timeout=30)
+            response = self._session.post(revoke_endpoint, headers=self.FORM_HEADERS, data=data, timeout=30)
             
             # Clear tokens regardless of revocation success
             self.access_token = None
@@ -176,7 +212,7 @@ class OAuthTokenManager:
             'has_access_token': bool(self.access_token),
             'has_refresh_token': bool(self.refresh_token),
             'expires_at': self.expires_at.isoformat() if self.expires_at else None,
-            'time_until_expiry': (self.expires_at - datetime.now()).total_seconds() if self.expires_at else None,
+            'time_until_expiry': self._expires_at_monotonic - time.monotonic() if self.expires_at else None,
             'should_refresh': self._should_refresh_token(),
             'token_type': self.token_type
         }
@@ -186,10 +222,10 @@ class OAuthTokenManager:
         if not self.access_token:
             return False
         
-        if not self.expires_at:
+        if self._expires_at_monotonic is None:
             return True  # Assume valid if no expiry time
         
-        return datetime.now() < self.expires_at
+        return time.monotonic() < self._expires_at_monotonic
 
 
 class VintedOAuthManager(OAuthTokenManager):
@@ -204,6 +240,9 @@ class VintedOAuthManager(OAuthTokenManager):
         # Vinted-specific settings
         self.scope = config.get('scope', ['read', 'write']) if config else ['read', 'write']
         self.redirect_uri = config.get('redirect_uri', 'http://localhost:8080/callback') if config else 'http://localhost:8080/callback'
+        
+        # Webhook signing key, encoded once
+        self._webhook_key = client_secret.encode() if client_secret else None
     
     def get_authorization_url(self, state: Optional[str] = None) -> str:
         """Get authorization URL for initial OAuth flow"""
@@ -219,17 +258,11 @@ class VintedOAuthManager(OAuthTokenManager):
         if state:
             params['state'] = state
         
-        query_string = '&'.join([f"{k}={v}" for k, v in params.items()])
-        return f"{auth_url}?{query_string}"
+        return f"{auth_url}?{urlencode(params, quote_via=quote)}"
     
     @retry_on_failure(RetryConfig(max_retries=3, backoff_factor=2))
     def exchange_code_for_tokens(self, authorization_code: str) -> Dict[str, Any]:
         """Exchange authorization code for access and refresh tokens"""
-        headers = {
-            'Content-Type': 'application/x-www-form-urlencoded',
-            'Accept': 'application/json'
-        }
-        
         data = {
             'grant_type': 'authorization_code',
             'code': authorization_code,
@@ -241,9 +274,9 @@ class VintedOAuthManager(OAuthTokenManager):
         self.logger.logger.info("Exchanging authorization code for tokens")
         
         start_time = time.time()
-        response = requests.post(
+        response = self._session.post(
             self.token_endpoint,
-            headers=headers,
+            headers=self.FORM_HEADERS,
             data=data,
             timeout=30
         )
@@ -278,18 +311,17 @@ class VintedOAuthManager(OAuthTokenManager):
             self.logger.logger.error(error_msg)
             raise Exception(error_msg)
     
-    def validate_webhook_signature(self, payload: str, signature: str) -> bool:
+    def validate_webhook_signature(self, payload: Union[str, bytes], signature: str) -> bool:
         """Validate Vinted webhook signature"""
-        import hmac
-        import hashlib
-        
-        if not self.client_secret:
+        if not self.client_secret or self._webhook_key is None:
             return False
         
-        expected_signature = hmac.new(
-            self.client_secret.encode(),
-            payload.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        # One-shot digest runs entirely in the OpenSSL-backed C implementation
+        expected_signature = hmac.digest(
+            self._webhook_key,
+            payload if isinstance(payload, bytes) else payload.encode(),
+            'sha256'
+        ).hex().encode()
         
-        return hmac.compare_digest(signature, expected_signature)
\ No newline at end of file
+        # Constant-time compare on bytes; str compare_digest rejects non-ASCII input
+        return hmac.compare_digest(signature.encode(), expected_signature)
\ No newline at end of file
@@ -1,92 +1,237 @@
 import asyncio
 import time
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from collections import OrderedDict
 from functools import wraps
-from typing import Callable, List, Any, Optional, Type, Union
+from typing import Callable, Iterable, List, Any, Optional, Type, Union
 import logging
 from requests import Response
 import requests
 
 
+JITTER_STRATEGIES = ('full', 'equal', 'decorrelated')
+NON_IDEMPOTENT_METHODS = frozenset(('POST', 'PATCH'))
+
+# C-level generator; scaled inline instead of going through random.uniform
+_random = random.random
+
+# Calls that time out keep their worker until they finish, so a few stuck
+# calls can occupy the whole pool; later calls then queue behind them
+TIMEOUT_MAX_WORKERS = 8
+_timeout_executor: Optional[ThreadPoolExecutor] = None
+_timeout_executor_lock = threading.Lock()
+
+
 class RetryConfig:
     """Configuration for retry behavior"""
     
+    __slots__ = ('_max_retries', '_backoff_factor', 'retry_on_status', 'retry_on_exceptions',
+                 'immediate_retry_statuses', 'backoff_statuses', 'idempotent', 'method_getter',
+                 '_max_backoff', 'jitter', 'jitter_strategy', '_backoff_table')
+    
     def __init__(self, 
                  max_retries: int = 3,
                  backoff_factor: float = 2.0,
                  retry_on_status: List[int] = None,
                  retry_on_exceptions: List[Type[Exception]] = None,
                  max_backoff: float = 60.0,
-                 jitter: bool = True):
-        self.max_retries = max_retries
-        self.backoff_factor = backoff_factor
-        self.retry_on_status = retry_on_status or [429, 500, 502, 503, 504]
-        self.retry_on_exceptions = retry_on_exceptions or [
+                 jitter: bool = True,
+                 jitter_strategy: str = 'full',
+                 idempotent: bool = True,
+                 method_getter: Optional[Callable[[tuple, dict], str]] = None,
+                 immediate_retry_statuses: Optional[Iterable[int]] = None):
+        self._max_retries = max_retries
+        self._backoff_factor = backoff_factor
+        self._max_backoff = max_backoff
+        self._build_backoff_table()
+        
+        # Set and tuple give O(1) status lookups and a single isinstance() call
+        self.retry_on_status = frozenset(retry_on_status or (429, 500, 502, 503, 504))
+        self.retry_on_exceptions = tuple(retry_on_exceptions or (
             requests.exceptions.ConnectionError,
             requests.exceptions.Timeout,
             requests.exceptions.RequestException
-        ]
-        self.max_backoff = max_backoff
+        ))
+        
+        # Immediate statuses follow Retry-After as given; the rest back off
+        self.immediate_retry_statuses = frozenset(immediate_retry_statuses or (429,))
+        self.backoff_statuses = self.retry_on_status - self.immediate_retry_statuses
+        
+        # Non-idempotent calls (or POST/PATCH per method_getter) only retry
+        # immediate statuses and never retry exceptions, so a create is
+        # never sent twice after a 5xx or timeout
+        self.idempotent = idempotent
+        self.method_getter = method_getter
         self.jitter = jitter
+        
+        # 'full', 'equal' or 'decorrelated' (AWS backoff-with-jitter variants)
+        if jitter_strategy not in JITTER_STRATEGIES:
+            raise ValueError(f"Unknown jitter strategy: {jitter_strategy}")
+        self.jitter_strategy = jitter_strategy
+    
+    def _build_backoff_table(self):
+        """Precompute capped exponential delays for every attempt the retry loop can reach"""
+        self._backoff_table = tuple(
+            min(self._backoff_factor ** attempt, self._max_backoff)
+            for attempt in range(self._max_retries + 2)
+        )
+    
+    # The backoff table depends on these, so it is rebuilt whenever one changes
+    @property
+    def max_retries(self) -> int:
+        return self._max_retries
+    
+    @max_retries.setter
+    def max_retries(self, value: int):
+        self._max_retries = value
+        self._build_backoff_table()
+    
+    @property
+    def backoff_factor(self) -> float:
+        return self._backoff_factor
+    
+    @backoff_factor.setter
+    def backoff_factor(self, value: float):
+        self._backoff_factor = value
+        self._build_backoff_table()
+    
+    @property
+    def max_backoff(self) -> float:
+        return self._max_backoff
+    
+    @max_backoff.setter
+    def max_backoff(self, value: float):
+        self._max_backoff = value
+        self._build_backoff_table()
+
+
+def _is_retry_safe(config: RetryConfig, args: tuple, kwargs: dict) -> bool:
+    """Check whether error responses from this call may be retried"""
+    if config.idempotent:
+        return True
+    if config.method_getter is None:
+        return False
+    return config.method_getter(args, kwargs).upper() not in NON_IDEMPOTENT_METHODS
+
+
+def _retry_steps(func_name: str, logger: logging.Logger, config: RetryConfig,
+                 retry_safe: bool = True):
+    """Retry policy shared by the sync and async decorators
+    
+    Send the outcome of each attempt as a (result, exception) pair. The
+    generator yields the delay to sleep before the next attempt, or None
+    when the caller should stop and return the result (or re-raise).
+    """
+    warn = logger.warning
+    max_retries = config.max_retries
+    retry_on_status = config.retry_on_status
+    backoff_statuses = config.backoff_statuses
+    retry_on_exceptions = config.retry_on_exceptions
+    response_type = Response
+    calc = calculate_backoff
+    backoff_time = None
+    
+    outcome = yield
+    for attempt in range(max_retries + 1):
+        result, error = outcome
+        can_retry = attempt < max_retries
+        
+        if error is not None:
+            # A timeout or dropped connection may still have created the
+            # resource, so non-idempotent calls never retry exceptions
+            if not retry_safe and isinstance(error, retry_on_exceptions):
+                logger.error("Not retrying non-idempotent call %s after %s", func_name, type(error).__name__)
+                yield None
+                return
+            
+            # Retry only exceptions of the configured types
+            if can_retry and isinstance(error, retry_on_exceptions):
+                backoff_time = calc(attempt, config, backoff_time)
+                warn(
+                    "Exception %s in %s: %s, retrying in %.2fs (attempt %d/%d)",
+                    type(error).__name__, func_name, error, backoff_time, attempt + 1, max_retries + 1
+                )
+                outcome = yield backoff_time
+                continue
+            
+            logger.error("Exception in %s: %s", func_name, error)
+            yield None
+            return
+        
+        # Check if result is a Response object with error status
+        if isinstance(result, response_type) and result.status_code in retry_on_status:
+            if not retry_safe and result.status_code in backoff_statuses:
+                logger.error("Not retrying non-idempotent call %s after HTTP %d", func_name, result.status_code)
+                yield None
+                return
+            
+            if can_retry:
+                backoff_time = calculate_response_backoff(result, attempt, config, backoff_time)
+                warn(
+                    "HTTP %d error in %s, retrying in %.2fs (attempt %d/%d)",
+                    result.status_code, func_name, backoff_time, attempt + 1, max_retries + 1
+                )
+                outcome = yield backoff_time
+                continue
+            
+            logger.error("Max retries exceeded for %s", func_name)
+            yield None
+            return
+        
+        # Success case
+        if attempt > 0:
+            logger.info("Function %s succeeded on attempt %d", func_name, attempt + 1)
+        
+        yield None
+        return
+
+
+def _start_steps(func_name: str, logger: logging.Logger, config: RetryConfig,
+                 args: tuple, kwargs: dict) -> Callable:
+    """Prime a retry policy generator and return its send method"""
+    steps = _retry_steps(func_name, logger, config, _is_retry_safe(config, args, kwargs))
+    next(steps)
+    return steps.send
 
 
 def retry_on_failure(config: RetryConfig = None):
     """Decorator to retry function calls on failure"""
     if config is None:
         config = RetryConfig()
+    retry_on_status = config.retry_on_status
     
     def decorator(func: Callable) -> Callable:
+        logger = logging.getLogger(func.__module__)
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            logger = logging.getLogger(func.__module__)
-            
-            last_exception = None
-            
-            for attempt in range(config.max_retries + 1):
+            send = None
+            while True:
                 try:
                     result = func(*args, **kwargs)
-                    
-                    # Check if result is a Response object with error status
-                    if isinstance(result, Response) and result.status_code in config.retry_on_status:
-                        if attempt < config.max_retries:
-                            backoff_time = calculate_backoff(attempt, config)
-                            logger.warning(
-                                f"HTTP {result.status_code} error in {func.__name__}, "
-                                f"retrying in {backoff_time:.2f}s (attempt {attempt + 1}/{config.max_retries + 1})"
-                            )
-                            time.sleep(backoff_time)
-                            continue
-                        else:
-                            logger.error(f"Max retries exceeded for {func.__name__}")
-                            return result
-                    
-                    # Success case
-                    if attempt > 0:
-                        logger.info(f"Function {func.__name__} succeeded on attempt {attempt + 1}")
-                    
-                    return result
-                    
                 except Exception as e:
-                    last_exception = e
-                    
-                    # Check if this exception should trigger a retry
-                    should_retry = any(isinstance(e, exc_type) for exc_type in config.retry_on_exceptions)
-                    
-                    if should_retry and attempt < config.max_retries:
-                        backoff_time = calculate_backoff(attempt, config)
-                        logger.warning(
-                            f"Exception {type(e).__name__} in {func.__name__}: {e}, "
-                            f"retrying in {backoff_time:.2f}s (attempt {attempt + 1}/{config.max_retries + 1})"
-                        )
-                        time.sleep(backoff_time)
-                        continue
-                    else:
-                        logger.error(f"Exception in {func.__name__}: {e}")
+                    if send is None:
+                        send = _start_steps(func.__name__, logger, config, args, kwargs)
+                    delay = send((None, e))
+                    if delay is None:
+                        # Bare raise keeps the original traceback unchanged
                         raise
-            
-            # If we get here, we've exhausted all retries
-            if last_exception:
-                raise last_exception
+                else:
+                    if send is None:
+                        # Fast path: most calls succeed on the first attempt
+                        if not isinstance(result, Response) or result.status_code not in retry_on_status:
+                            return result
+                        send = _start_steps(func.__name__, logger, config, args, kwargs)
+                    delay = send((result, None))
+                    if delay is None:
+                        return result
+                
+                time.sleep(delay)
             
         return wrapper
     return decorator
@@ -96,161 +241,354 @@ def async_retry_on_failure(config: RetryConfig = None):
     """Async decorator to retry function calls on failure"""
     if config is None:
         config = RetryConfig()
+    retry_on_status = config.retry_on_status
     
     def decorator(func: Callable) -> Callable:
+        logger = logging.getLogger(func.__module__)
+        
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            logger = logging.getLogger(func.__module__)
-            
-            last_exception = None
-            
-            for attempt in range(config.max_retries + 1):
+            send = None
+            while True:
                 try:
                     result = await func(*args, **kwargs)
-                    
-                    # Check if result is a Response object with error status
-                    if isinstance(result, Response) and result.status_code in config.retry_on_status:
-                        if attempt < config.max_retries:
-                            backoff_time = calculate_backoff(attempt, config)
-                            logger.warning(
-                                f"HTTP {result.status_code} error in {func.__name__}, "
-                                f"retrying in {backoff_time:.2f}s (attempt {attempt + 1}/{config.max_retries + 1})"
-                            )
-                            await asyncio.sleep(backoff_time)
-                            continue
-                        else:
-                            logger.error(f"Max retries exceeded for {func.__name__}")
-                            return result
-                    
-                    # Success case
-                    if attempt > 0:
-                        logger.info(f"Function {func.__name__} succeeded on attempt {attempt + 1}")
-                    
-                    return result
-                    
                 except Exception as e:
-                    last_exception = e
-                    
-                    # Check if this exception should trigger a retry
-                    should_retry = any(isinstance(e, exc_type) for exc_type in config.retry_on_exceptions)
-                    
-                    if should_retry and attempt < config.max_retries:
-                        backoff_time = calculate_backoff(attempt, config)
-                        logger.warning(
-                            f"Exception {type(e).__name__} in {func.__name__}: {e}, "
-                            f"retrying in {backoff_time:.2f}s (attempt {attempt + 1}/{config.max_retries + 1})"
-                        )
-                        await asyncio.sleep(backoff_time)
-                        continue
-                    else:
-                        logger.error(f"Exception in {func.__name__}: {e}")
+                    if send is None:
+                        send = _start_steps(func.__name__, logger, config, args, kwargs)
+                    delay = send((None, e))
+                    if delay is None:
+                        # Bare raise keeps the original traceback unchanged
                         raise
+                else:
+                    if send is None:
+                        # Fast path: most calls succeed on the first attempt
+                        if not isinstance(result, Response) or result.status_code not in retry_on_status:
+                            return result
+                        send = _start_steps(func.__name__, logger, config, args, kwargs)
+                    delay = send((result, None))
+                    if delay is None:
+                        return result
+                
+                await asyncio.sleep(delay)
+            
+        return wrapper
+    return decorator
+
+
+def cached_with_retry(ttl_seconds: float,
+                      key_fn: Optional[Callable[..., Any]] = None,
+                      config: RetryConfig = None,
+                      maxsize: int = 128,
+                      clock: Callable[[], float] = time.monotonic):
+    """Decorator caching results for ttl_seconds beneath the retry layer
+    
+    Cache hits skip the request entirely. If a call is rate limited (429)
+    while an older result is cached, that result is served and kept for the
+    Retry-After period instead of retrying. At most maxsize entries are kept,
+    evicting the least recently used. Expiry is measured with clock.
+    """
+    def decorator(func: Callable) -> Callable:
+        cache = OrderedDict()
+        lock = threading.Lock()
+        
+        def store(key, value, expires_at):
+            # Caller holds the lock
+            cache[key] = (value, expires_at)
+            cache.move_to_end(key)
+            while len(cache) > maxsize:
+                cache.popitem(last=False)
+        
+        def make_key(*args, **kwargs):
+            if key_fn is not None:
+                return key_fn(*args, **kwargs)
+            return (func.__qualname__, args, frozenset(kwargs.items()))
+        
+        @wraps(func)
+        def cached(*args, **kwargs):
+            key = make_key(*args, **kwargs)
+            with lock:
+                entry = cache.get(key)
+                if entry is not None:
+                    cache.move_to_end(key)
+            if entry is not None and clock() < entry[1]:
+                return entry[0]
+            
+            result = func(*args, **kwargs)
+            now = clock()
             
-            # If we get here, we've exhausted all retries
-            if last_exception:
-                raise last_exception
+            if isinstance(result, Response) and result.status_code >= 400:
+                if result.status_code == 429 and entry is not None:
+                    retry_after = parse_retry_after(result.headers.get('Retry-After'))
+                    with lock:
+                        store(key, entry[0], now + (retry_after or ttl_seconds))
+                    return entry[0]
+                return result
             
+            with lock:
+                store(key, result, now + ttl_seconds)
+            return result
+        
+        wrapper = retry_on_failure(config)(cached)
+        wrapper.cache_clear = cache.clear
+        wrapper.cache_size = cache.__len__
         return wrapper
     return decorator
 
 
-def calculate_backoff(attempt: int, config: RetryConfig) -> float:
-    """Calculate backoff time for retry attempt"""
-    backoff = config.backoff_factor ** attempt
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given as delay seconds or an HTTP-date"""
+    if not value:
+        return None
+    
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def calculate_response_backoff(response: Response, attempt: int, config: RetryConfig,
+                               previous_backoff: Optional[float] = None) -> float:
+    """Calculate backoff for a retryable response, honoring Retry-After"""
+    backoff = calculate_backoff(attempt, config, previous_backoff)
+    
+    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+    if retry_after is None:
+        return backoff
+    
+    # Immediate statuses (429): the server says exactly when to come back
+    if response.status_code in config.immediate_retry_statuses:
+        return min(retry_after, config.max_backoff)
+    
+    return min(max(retry_after, backoff), config.max_backoff)
+
+
+def calculate_backoff(attempt: int, config: RetryConfig,
+                      previous_backoff: Optional[float] = None) -> float:
+    """Calculate backoff time for retry attempt
     
+    With jitter enabled, concurrent callers are spread out so they don't
+    retry in lockstep: 'full' sleeps uniformly in [0, cap], 'equal' in
+    [cap / 2, cap], and 'decorrelated' grows from the previous sleep.
+    """
     # Cap at max_backoff
-    backoff = min(backoff, config.max_backoff)
+    table = config._backoff_table
+    if attempt < len(table):
+        backoff = table[attempt]
+    else:
+        backoff = min(config.backoff_factor ** attempt, config.max_backoff)
+    
+    if not config.jitter:
+        return backoff
     
-    # Add jitter if enabled
-    if config.jitter:
-        jitter_range = backoff * 0.1  # 10% jitter
-        backoff += random.uniform(-jitter_range, jitter_range)
+    if config.jitter_strategy == 'full':
+        return backoff * _random()
     
-    return max(0, backoff)
+    if config.jitter_strategy == 'equal':
+        half = backoff / 2
+        return half + half * _random()
+    
+    # Decorrelated jitter
+    base = config.backoff_factor
+    previous = previous_backoff if previous_backoff is not None else base
+    upper = max(base, previous * 3)
+    return min(config.max_backoff, base + (upper - base) * _random())
+
+
+class CircuitState(IntEnum):
+    """States of a circuit breaker"""
+    CLOSED = 0
+    OPEN = 1
+    HALF_OPEN = 2
 
 
 class CircuitBreaker:
-    """Circuit breaker pattern for handling repeated failures"""
+    """Circuit breaker pattern for handling repeated failures
+    
+    Once OPEN, a single probe call is let through per recovery window. Each
+    failed probe doubles the window, up to max_recovery_timeout.
+    """
+    
+    __slots__ = ('failure_threshold', 'recovery_timeout', 'max_recovery_timeout',
+                 'expected_exception', 'failure_count', 'last_failure_time', 'state',
+                 '_open_timeout', '_probe_in_flight', '_monotonic', '_lock', 'logger')
     
     def __init__(self, 
                  failure_threshold: int = 5,
                  recovery_timeout: float = 60.0,
-                 expected_exception: Type[Exception] = Exception):
+                 expected_exception: Type[Exception] = Exception,
+                 max_recovery_timeout: float = 600.0):
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
+        self.max_recovery_timeout = max(recovery_timeout, max_recovery_timeout)
         self.expected_exception = expected_exception
         
         self.failure_count = 0
         self.last_failure_time = None
-        self.state = 'CLOSED'  # CLOSED, OPEN, HALF_OPEN
+        self.state = CircuitState.CLOSED
+        self._open_timeout = recovery_timeout
+        self._probe_in_flight = False
+        
+        # Monotonic clock so wall-clock jumps cannot stall or skip recovery
+        self._monotonic = time.monotonic
+        # Guards failure counting and state transitions across threads
+        self._lock = threading.Lock()
         
         self.logger = logging.getLogger(self.__class__.__name__)
     
     def __call__(self, func: Callable) -> Callable:
         @wraps(func)
         def wrapper(*args, **kwargs):
-            if self.state == 'OPEN':
-                if self._should_attempt_reset():
-                    self.state = 'HALF_OPEN'
-                    self.logger.info("Circuit breaker moving to HALF_OPEN state")
-                else:
-                    raise Exception("Circuit breaker is OPEN")
+            if not self.try_acquire():
+                raise Exception("Circuit breaker is OPEN")
             
             try:
                 result = func(*args, **kwargs)
-                self._on_success()
-                return result
             except self.expected_exception as e:
                 self._on_failure()
                 raise
+            except BaseException:
+                self._release_probe()
+                raise
+            
+            self._on_success()
+            return result
         
         return wrapper
     
+    def try_acquire(self) -> bool:
+        """Check whether a call may go through, admitting one HALF_OPEN probe"""
+        # Unlocked read: the common CLOSED path never contends
+        if self.state == CircuitState.CLOSED:
+            return True
+        
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return True
+            if self._probe_in_flight:
+                return False
+            if self.state == CircuitState.OPEN:
+                if not self._should_attempt_reset():
+                    return False
+                self.state = CircuitState.HALF_OPEN
+            self._probe_in_flight = True
+        
+        self.logger.info("Circuit breaker moving to HALF_OPEN state")
+        return True
+    
     def _should_attempt_reset(self) -> bool:
         """Check if we should attempt to reset the circuit breaker"""
         if self.last_failure_time is None:
             return True
         
-        return time.time() - self.last_failure_time >= self.recovery_timeout
+        return self._monotonic() - self.last_failure_time >= self._open_timeout
+    
+    def _release_probe(self):
+        """Let another caller probe after an unexpected exception"""
+        if self.state != CircuitState.HALF_OPEN:
+            return
+        
+        with self._lock:
+            self._probe_in_flight = False
     
     def _on_success(self):
         """Handle successful function call"""
-        if self.state == 'HALF_OPEN':
-            self.state = 'CLOSED'
+        if self.state != CircuitState.HALF_OPEN:
+            return
+        
+        with self._lock:
+            if self.state != CircuitState.HALF_OPEN:
+                return
+            self.state = CircuitState.CLOSED
             self.failure_count = 0
-            self.logger.info("Circuit breaker reset to CLOSED state")
+            self._open_timeout = self.recovery_timeout
+            self._probe_in_flight = False
+        
+        self.logger.info("Circuit breaker reset to CLOSED state")
     
     def _on_failure(self):
         """Handle failed function call"""
-        self.failure_count += 1
-        self.last_failure_time = time.time()
+        with self._lock:
+            self.failure_count += 1
+            self.last_failure_time = self._monotonic()
+            
+            if self.state == CircuitState.HALF_OPEN:
+                # Failed probe: reopen and wait longer before the next one
+                self.state = CircuitState.OPEN
+                self._probe_in_flight = False
+                self._open_timeout = min(self._open_timeout * 2, self.max_recovery_timeout)
+                open_timeout = self._open_timeout
+                probe_failed = True
+            elif self.failure_count < self.failure_threshold or self.state == CircuitState.OPEN:
+                return
+            else:
+                self.state = CircuitState.OPEN
+                failure_count = self.failure_count
+                probe_failed = False
         
-        if self.failure_count >= self.failure_threshold:
-            self.state = 'OPEN'
-            self.logger.warning(f"Circuit breaker opened after {self.failure_count} failures")
+        if probe_failed:
+            self.logger.warning("Circuit breaker probe failed, reopening for %.1fs", open_timeout)
+        else:
+            self.logger.warning("Circuit breaker opened after %d failures", failure_count)
+
+
+def _get_timeout_executor() -> ThreadPoolExecutor:
+    """Lazily create the shared executor used by with_timeout"""
+    global _timeout_executor
+    if _timeout_executor is None:
+        with _timeout_executor_lock:
+            if _timeout_executor is None:
+                _timeout_executor = ThreadPoolExecutor(max_workers=TIMEOUT_MAX_WORKERS,
+                                                       thread_name_prefix='with_timeout')
+    return _timeout_executor
 
 
 def with_timeout(timeout_seconds: float):
-    """Decorator to add timeout to function calls"""
+    """Decorator to add timeout to function calls
+    
+    The call runs on a shared worker thread, so it works from any thread and
+    honours fractional timeouts. A call that times out is not interrupted; it
+    keeps running in the background, holding one of TIMEOUT_MAX_WORKERS
+    workers, and its result is discarded. A timeout of zero or less (or None)
+    disables the timeout and calls the function directly.
+    """
     def decorator(func: Callable) -> Callable:
+        if timeout_seconds is None or timeout_seconds <= 0:
+            return func
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            import signal
-            
-            def timeout_handler(signum, frame):
-                raise TimeoutError(f"Function {func.__name__} timed out after {timeout_seconds} seconds")
-            
-            # Set up the timeout
-            old_handler = signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(int(timeout_seconds))
-            
+            future = _get_timeout_executor().submit(func, *args, **kwargs)
             try:
-                result = func(*args, **kwargs)
-                return result
-            finally:
-                # Clean up
-                signal.alarm(0)
-                signal.signal(signal.SIGALRM, old_handler)
+                return future.result(timeout=timeout_seconds)
+            except FutureTimeoutError:
+                future.cancel()
+                raise TimeoutError(f"Function {func.__name__} timed out after {timeout_seconds} seconds")
+        
+        return wrapper
+    return decorator
+
+
+def with_deadline(timeout_seconds: float):
+    """Decorator passing a monotonic ``deadline`` kwarg for in-thread timeouts
+    
+    The wrapped function runs in the calling thread and is expected to check
+    ``time.monotonic() >= deadline`` itself at convenient points.
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            kwargs.setdefault('deadline', time.monotonic() + timeout_seconds)
+            return func(*args, **kwargs)
         
         return wrapper
     return decorator
@@ -1,8 +1,10 @@
 import pytest
+import copy
+import dataclasses
 import json
 from pathlib import Path
 from datetime import datetime
-from unittest.mock import Mock
+import requests
 
 # Add project root to path
 import sys
@@ -13,9 +15,41 @@ from src.models.listing_data import ListingData
 from src.models.sale_data import SaleData
 
 
-@pytest.fixture
-def sample_listing_data():
-    """Sample listing data for testing"""
+def pytest_configure(config):
+    config.addinivalue_line("markers", "unit: pure in-memory test with no HTTP mocking")
+    config.addinivalue_line("markers", "http: test that mocks HTTP transport")
+
+
+def pytest_collection_modifyitems(config, items):
+    # Run cheap unit tests first within each class/module, so failures surface
+    # early without splitting up class- and module-scoped fixtures
+    group_order = {}
+    for item in items:
+        group_order.setdefault(item.parent.nodeid, len(group_order))
+    items.sort(key=lambda item: (group_order[item.parent.nodeid],
+                                 item.get_closest_marker("unit") is None))
+
+
+MERCARI_BASE = "https://api-sandbox.mercari.com/v1"
+MERCARI_PROFILE_URL = f"{MERCARI_BASE}/user/profile"
+MERCARI_ITEMS_URL = f"{MERCARI_BASE}/items"
+MERCARI_ITEM_URL = f"{MERCARI_BASE}/items/listing_12345"
+MERCARI_SALES_URL = f"{MERCARI_BASE}/sales"
+
+# Mercari sandbox endpoints: name -> (method, url, mock_api_responses key, status)
+MERCARI_URLS = {
+    "auth": ("GET", MERCARI_PROFILE_URL, "auth_success", 200),
+    "create": ("POST", MERCARI_ITEMS_URL, "create_listing_success", 201),
+    "update": ("PUT", MERCARI_ITEM_URL, "update_listing_success", 200),
+    "delete": ("DELETE", MERCARI_ITEM_URL, None, 204),
+    "fetch_listings": ("GET", MERCARI_ITEMS_URL, "fetch_listings_success", 200),
+    "fetch_sales": ("GET", MERCARI_SALES_URL, "fetch_sales_success", 200),
+}
+
+
+@pytest.fixture(scope="session")
+def _sample_listing_data_template():
+    """Shared sample listing; tests receive copies via sample_listing_data"""
     return ListingData(
         item_id="test_item_001",
         platform="mercari",
@@ -35,6 +69,39 @@ def sample_listing_data():
     )
 
 
+@pytest.fixture
+def sample_listing_data(_sample_listing_data_template):
+    """Sample listing data for testing"""
+    template = _sample_listing_data_template
+    return dataclasses.replace(template, photos=list(template.photos), extra=dict(template.extra))
+
+
+@pytest.fixture
+def sample_listing_dict(sample_listing_data):
+    """Sample listing data serialized with to_dict"""
+    # Built from the per-test copy so photos/extra are never shared across tests
+    return sample_listing_data.to_dict()
+
+
+@pytest.fixture(scope="session")
+def listing_factory():
+    """Factory building a minimal valid ListingData with field overrides"""
+    def make_listing(**overrides):
+        fields = {
+            "item_id": "test_item_001",
+            "platform": "mercari",
+            "platform_listing_id": "",
+            "title": "Test Title",
+            "description": "Test Description",
+            "price": 100.0,
+            "quantity": 1,
+            "condition": "Good"
+        }
+        fields.update(overrides)
+        return ListingData(**fields)
+    return make_listing
+
+
 @pytest.fixture
 def sample_sale_data():
     """Sample sale data for testing"""
@@ -42,7 +109,7 @@ def sample_sale_data():
         sale_id="sale_001",
         listing_id="listing_001",
         buyer_info={"username": "test_buyer", "rating": 4.8},
-        sale_date=datetime.now(),
+        sale_date=datetime(2024, 1, 1),
         gross_amount=250.00,
         fees=32.25,
         net_amount=217.75,
@@ -50,7 +117,7 @@ def sample_sale_data():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mercari_config():
     """Mercari platform configuration for testing"""
     return {
@@ -71,7 +138,7 @@ def mercari_config():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def vinted_config():
     """Vinted platform configuration for testing"""
     return {
@@ -92,9 +159,9 @@ def vinted_config():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_config(mercari_config, vinted_config):
-    """Complete test configuration"""
+    """Complete test configuration (shared; use mutable_test_config to modify)"""
     return {
         "platforms": {
             "mercari": mercari_config,
@@ -116,6 +183,12 @@ def test_config(mercari_config, vinted_config):
 
 
 @pytest.fixture
+def mutable_test_config(test_config):
+    """Per-test copy of the complete test configuration for tests that modify it"""
+    return copy.deepcopy(test_config)
+
+
+@pytest.fixture(scope="session")
 def mock_api_responses():
     """Mock API responses for testing"""
     return {
@@ -180,15 +253,45 @@ def mock_api_responses():
     }
 
 
+@pytest.fixture(scope="session")
+def make_response():
+    """Factory for real requests.Response objects with a canned body"""
+    def build(status=200, json_data=None, text="", content=b"", headers=None):
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers or {})
+        if json_data is not None:
+            content = json.dumps(json_data).encode()
+        response._content = content or text.encode()
+        response.encoding = "utf-8"
+        return response
+    return build
+
+
+@pytest.fixture
+def http_mock(requests_mock):
+    """Intercept HTTP calls made through requests for the duration of a test"""
+    return requests_mock
+
+
+@pytest.fixture(scope="session")
+def mercari_urls():
+    """Mercari sandbox URLs keyed by endpoint name, plus the API base"""
+    urls = {name: url for name, (_, url, _, _) in MERCARI_URLS.items()}
+    urls["base"] = MERCARI_BASE
+    return urls
+
+
 @pytest.fixture
-def mock_requests_session():
-    """Mock requests session for testing"""
-    session = Mock()
-    response = Mock()
-    response.status_code = 200
-    response.json.return_value = {"data": {"id": "test_id"}}
-    session.get.return_value = response
-    session.post.return_value = response
-    session.put.return_value = response
-    session.delete.return_value = response
-    return session
\ No newline at end of file
+def mock_mercari(http_mock, mock_api_responses):
+    """Register canned Mercari responses for the named endpoints in one call"""
+    responses = mock_api_responses["mercari"]
+    def register(*endpoints):
+        for endpoint in endpoints:
+            method, url, key, status = MERCARI_URLS[endpoint]
+            if key is None:
+                http_mock.register_uri(method, url, status_code=status)
+            else:
+                http_mock.register_uri(method, url, json=responses[key], status_code=status)
+        return http_mock
+    return register
@@ -42,32 +42,38 @@ class TestListingData:
         listing.title = "Test Title"
         assert listing.validate() is True
     
-    def test_validate_invalid_price(self, sample_listing_data):
-        """Test validation with invalid price"""
-        sample_listing_data.price = 0
-        assert sample_listing_data.validate() is False
-        
-        sample_listing_data.price = -10
-        assert sample_listing_data.validate() is False
+    @pytest.mark.parametrize("price,expected", [
+        (100.0, True),
+        (0.01, True),
+        (0, False),
+        (-10, False),
+    ])
+    def test_validate_price(self, listing_factory, price, expected):
+        """Test validation of listing price"""
+        assert listing_factory(price=price).validate() is expected
     
-    def test_validate_invalid_quantity(self, sample_listing_data):
-        """Test validation with invalid quantity"""
-        sample_listing_data.quantity = 0
-        assert sample_listing_data.validate() is False
-        
-        sample_listing_data.quantity = -1
-        assert sample_listing_data.validate() is False
+    @pytest.mark.parametrize("quantity,expected", [
+        (1, True),
+        (5, True),
+        (0, False),
+        (-1, False),
+    ])
+    def test_validate_quantity(self, listing_factory, quantity, expected):
+        """Test validation of listing quantity"""
+        assert listing_factory(quantity=quantity).validate() is expected
     
-    def test_validate_invalid_condition(self, sample_listing_data):
-        """Test validation with invalid condition"""
-        sample_listing_data.condition = "Invalid Condition"
-        assert sample_listing_data.validate() is False
-        
-        # Test valid conditions
-        valid_conditions = ['New', 'Like New', 'Excellent', 'Good', 'Fair', 'Poor']
-        for condition in valid_conditions:
-            sample_listing_data.condition = condition
-            assert sample_listing_data.validate() is True
+    @pytest.mark.parametrize("condition,expected", [
+        ("New", True),
+        ("Like New", True),
+        ("Excellent", True),
+        ("Good", True),
+        ("Fair", True),
+        ("Poor", True),
+        ("Invalid Condition", False),
+    ])
+    def test_validate_condition(self, listing_factory, condition, expected):
+        """Test validation of listing condition"""
+        assert listing_factory(condition=condition).validate() is expected
     
     def test_to_dict(self, sample_listing_data):
         """Test converting ListingData to dictionary"""
@@ -1,11 +1,30 @@
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 
 from src.platforms.facebook_marketplace import FacebookMarketplacePlatform
 from src.models.listing_data import ListingData
 
 
-@pytest.fixture
+_FB_FETCH_LISTINGS_PAYLOAD = {
+    'data': [
+        {
+            'id': 'product_123',
+            'retailer_id': 'item_001',
+            'name': 'Supreme Box Logo Hoodie',
+            'description': 'Authentic Supreme hoodie',
+            'price': 25000,  # Price in cents
+            'condition': 'GOOD',
+            'category': 'APPAREL',
+            'brand': 'Supreme',
+            'image_url': 'https://example.com/photo1.jpg',
+            'availability': 'in stock',
+            'inventory': 1
+        }
+    ]
+}
+
+
+@pytest.fixture(scope="module")
 def facebook_config():
     """Facebook platform configuration for testing"""
     return {
@@ -19,106 +38,91 @@ def facebook_config():
     }
 
 
+@pytest.fixture
+def fb_platform(facebook_config):
+    """Facebook Marketplace platform built from the test configuration"""
+    return FacebookMarketplacePlatform(facebook_config)
+
+
+@pytest.fixture
+def fb_platform_auth(fb_platform):
+    """Facebook Marketplace platform already marked as authenticated"""
+    fb_platform.authenticated = True
+    return fb_platform
+
+
+@pytest.fixture(scope="module")
+def expected_price_cents(_sample_listing_data_template):
+    """Catalog price in cents for the sample listing"""
+    return int(_sample_listing_data_template.price * 100)
+
+
 class TestFacebookMarketplacePlatform:
     
-    def test_init(self, facebook_config):
+    @pytest.mark.unit
+    def test_init(self, fb_platform):
         """Test FacebookMarketplacePlatform initialization"""
-        platform = FacebookMarketplacePlatform(facebook_config)
-        
-        assert platform.app_id == "test_app_id"
-        assert platform.app_secret == "test_app_secret"
-        assert platform.access_token == "test_access_token"
-        assert platform.page_id == "test_page_id"
-        assert platform.catalog_id == "test_catalog_id"
-        assert platform.base_url == "https://graph.facebook.com/v18.0"
-    
-    @patch('src.platforms.facebook_marketplace.requests.get')
-    def test_authenticate_success(self, mock_get, facebook_config):
-        """Test successful authentication"""
-        platform = FacebookMarketplacePlatform(facebook_config)
-        
-        # Mock API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'id': '123456789',
-            'name': 'Test User'
-        }
-        mock_get.return_value = mock_response
-        
-        result = platform.authenticate()
-        assert result is True
-        assert platform.authenticated is True
-    
-    @patch('src.platforms.facebook_marketplace.requests.get')
-    def test_authenticate_failure(self, mock_get, facebook_config):
-        """Test failed authentication"""
-        platform = FacebookMarketplacePlatform(facebook_config)
-        
-        # Mock API response
-        mock_response = Mock()
-        mock_response.status_code = 401
-        mock_response.text = "Invalid access token"
-        mock_get.return_value = mock_response
-        
-        result = platform.authenticate()
-        assert result is False
-        assert platform.authenticated is False
-    
-    def test_list_item_success(self, facebook_config, sample_listing_data):
+        assert fb_platform.app_id == "test_app_id"
+        assert fb_platform.app_secret == "test_app_secret"
+        assert fb_platform.access_token == "test_access_token"
+        assert fb_platform.page_id == "test_page_id"
+        assert fb_platform.catalog_id == "test_catalog_id"
+        assert fb_platform.base_url == "https://graph.facebook.com/v18.0"
+    
+    @pytest.mark.http
+    @pytest.mark.parametrize("status,expected", [(200, True), (401, False), (500, False)])
+    def test_authenticate(self, http_mock, fb_platform, status, expected):
+        """Test authentication outcome for each Graph API response status"""
+        http_mock.get(
+            "https://graph.facebook.com/v18.0/me",
+            json={'id': '123456789', 'name': 'Test User'},
+            status_code=status
+        )
+        
+        assert fb_platform.authenticate() is expected
+        assert fb_platform.authenticated is expected
+    
+    def test_list_item_success(self, fb_platform_auth, sample_listing_data):
         """Test successful item listing"""
-        platform = FacebookMarketplacePlatform(facebook_config)
-        platform.authenticated = True
-        
         # Mock the two-step listing process
-        platform._create_product_in_catalog = Mock(return_value="product_123")
-        platform._create_marketplace_listing = Mock(return_value="listing_456")
+        fb_platform_auth._create_product_in_catalog = Mock(return_value="product_123")
+        fb_platform_auth._create_marketplace_listing = Mock(return_value="listing_456")
         
-        listing_id = platform.list_item(sample_listing_data)
+        listing_id = fb_platform_auth.list_item(sample_listing_data)
         assert listing_id == "listing_456"
         
         # Verify both steps were called
-        platform._create_product_in_catalog.assert_called_once_with(sample_listing_data)
-        platform._create_marketplace_listing.assert_called_once_with("product_123", sample_listing_data)
+        fb_platform_auth._create_product_in_catalog.assert_called_once_with(sample_listing_data)
+        fb_platform_auth._create_marketplace_listing.assert_called_once_with("product_123", sample_listing_data)
     
-    @patch('src.platforms.facebook_marketplace.requests.post')
-    def test_create_product_in_catalog(self, mock_post, facebook_config, sample_listing_data):
+    @pytest.mark.http
+    def test_create_product_in_catalog(self, http_mock, fb_platform, sample_listing_data, expected_price_cents):
         """Test creating product in catalog"""
-        platform = FacebookMarketplacePlatform(facebook_config)
+        http_mock.post(
+            "https://graph.facebook.com/v18.0/test_catalog_id/products",
+            json={'id': 'product_123456'},
+            status_code=200
+        )
         
-        # Mock API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'id': 'product_123456'
-        }
-        mock_post.return_value = mock_response
-        
-        product_id = platform._create_product_in_catalog(sample_listing_data)
+        product_id = fb_platform._create_product_in_catalog(sample_listing_data)
         assert product_id == "product_123456"
         
         # Verify request was made with correct data
-        mock_post.assert_called_once()
-        call_args = mock_post.call_args
-        assert 'json' in call_args.kwargs
-        payload = call_args.kwargs['json']
+        assert http_mock.call_count == 1
+        payload = http_mock.last_request.json()
         assert payload['name'] == sample_listing_data.title
-        assert payload['price'] == int(sample_listing_data.price * 100)  # Price in cents
+        assert payload['price'] == expected_price_cents
     
-    @patch('src.platforms.facebook_marketplace.requests.post')
-    def test_create_marketplace_listing(self, mock_post, facebook_config, sample_listing_data):
+    @pytest.mark.http
+    def test_create_marketplace_listing(self, http_mock, fb_platform, sample_listing_data):
         """Test creating marketplace listing"""
-        platform = FacebookMarketplacePlatform(facebook_config)
-        
-        # Mock API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'id': 'listing_789'
-        }
-        mock_post.return_value = mock_response
+        http_mock.post(
+            "https://graph.facebook.com/v18.0/test_page_id/marketplace_listings",
+            json={'id': 'listing_789'},
+            status_code=200
+        )
         
-        listing_id = platform._create_marketplace_listing("product_123", sample_listing_data)
+        listing_id = fb_platform._create_marketplace_listing("product_123", sample_listing_data)
         assert listing_id == "listing_789"
     
     def test_list_item_no_catalog_id(self, sample_listing_data):
@@ -136,148 +140,111 @@ class TestFacebookMarketplacePlatform:
         
         assert "Catalog ID not configured" in str(exc_info.value)
     
-    @patch('src.platforms.facebook_marketplace.requests.post')
-    def test_update_listing_success(self, mock_post, facebook_config, sample_listing_data):
+    @pytest.mark.http
+    def test_update_listing_success(self, http_mock, fb_platform_auth, sample_listing_data):
         """Test successful listing update"""
-        platform = FacebookMarketplacePlatform(facebook_config)
-        platform.authenticated = True
-        
-        # Mock API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'success': True
-        }
-        mock_post.return_value = mock_response
+        http_mock.post(
+            "https://graph.facebook.com/v18.0/listing_123",
+            json={'success': True},
+            status_code=200
+        )
         
-        result = platform.update_listing("listing_123", sample_listing_data)
+        result = fb_platform_auth.update_listing("listing_123", sample_listing_data)
         assert result["success"] is True
         assert result["listing_id"] == "listing_123"
     
-    @patch('src.platforms.facebook_marketplace.requests.delete')
-    def test_delete_listing_success(self, mock_delete, facebook_config):
+    @pytest.mark.http
+    def test_delete_listing_success(self, http_mock, fb_platform_auth):
         """Test successful listing deletion"""
-        platform = FacebookMarketplacePlatform(facebook_config)
-        platform.authenticated = True
-        
-        # Mock API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_delete.return_value = mock_response
+        http_mock.delete("https://graph.facebook.com/v18.0/listing_123", status_code=200)
         
-        result = platform.delete_listing("listing_123")
+        result = fb_platform_auth.delete_listing("listing_123")
         assert result is True
     
-    @patch('src.platforms.facebook_marketplace.requests.get')
-    def test_fetch_listings_success(self, mock_get, facebook_config):
+    @pytest.mark.http
+    def test_fetch_listings_success(self, http_mock, fb_platform_auth):
         """Test successful listings fetch"""
-        platform = FacebookMarketplacePlatform(facebook_config)
-        platform.authenticated = True
-        
-        # Mock API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'data': [
-                {
-                    'id': 'product_123',
-                    'retailer_id': 'item_001',
-                    'name': 'Supreme Box Logo Hoodie',
-                    'description': 'Authentic Supreme hoodie',
-                    'price': 25000,  # Price in cents
-                    'condition': 'GOOD',
-                    'category': 'APPAREL',
-                    'brand': 'Supreme',
-                    'image_url': 'https://example.com/photo1.jpg',
-                    'availability': 'in stock',
-                    'inventory': 1
-                }
-            ]
-        }
-        mock_get.return_value = mock_response
+        http_mock.get(
+            "https://graph.facebook.com/v18.0/test_catalog_id/products",
+            json=_FB_FETCH_LISTINGS_PAYLOAD,
+            status_code=200
+        )
         
-        listings = platform.fetch_listings()
+        listings = fb_platform_auth.fetch_listings()
         assert len(listings) == 1
         assert isinstance(listings[0], ListingData)
         assert listings[0].title == "Supreme Box Logo Hoodie"
         assert listings[0].price == 250.0  # Converted from cents
         assert listings[0].platform == "facebook_marketplace"
     
-    def test_fetch_sales(self, facebook_config):
+    def test_fetch_sales(self, fb_platform_auth):
         """Test sales fetch (limited data)"""
-        platform = FacebookMarketplacePlatform(facebook_config)
-        platform.authenticated = True
-        
         # Facebook Marketplace doesn't provide comprehensive sales data
-        sales = platform.fetch_sales()
+        sales = fb_platform_auth.fetch_sales()
         assert isinstance(sales, list)
         assert len(sales) == 0  # Should return empty list
     
-    def test_get_platform_fees(self, facebook_config):
+    @pytest.mark.unit
+    def test_get_platform_fees(self, fb_platform):
         """Test platform fee calculation"""
-        platform = FacebookMarketplacePlatform(facebook_config)
-        
         sale_amount = 100.00
-        fees = platform.get_platform_fees(sale_amount)
+        fees = fb_platform.get_platform_fees(sale_amount)
         
         # Facebook doesn't charge fees for organic listings
         assert fees == 0.0
     
-    def test_condition_mapping(self, facebook_config):
+    @pytest.mark.unit
+    @pytest.mark.parametrize("raw,expected", [
+        ("New", "NEW"),
+        ("Like New", "LIKE_NEW"),
+        ("Excellent", "GOOD"),
+        ("Good", "GOOD"),
+        ("Fair", "FAIR"),
+        ("Poor", "POOR"),
+        ("Unknown", "GOOD"),  # Default
+    ])
+    def test_condition_mapping(self, fb_platform, raw, expected):
         """Test condition mapping"""
-        platform = FacebookMarketplacePlatform(facebook_config)
-        
-        assert platform.map_condition("New") == "NEW"
-        assert platform.map_condition("Like New") == "LIKE_NEW"
-        assert platform.map_condition("Excellent") == "GOOD"
-        assert platform.map_condition("Good") == "GOOD"
-        assert platform.map_condition("Fair") == "FAIR"
-        assert platform.map_condition("Poor") == "POOR"
-        assert platform.map_condition("Unknown") == "GOOD"  # Default
-    
-    def test_category_mapping(self, facebook_config):
+        assert fb_platform.map_condition(raw) == expected
+    
+    @pytest.mark.unit
+    @pytest.mark.parametrize("raw,expected", [
+        ("Clothing", "APPAREL"),
+        ("Shoes", "SHOES"),
+        ("Accessories", "ACCESSORIES"),
+        ("Bags", "BAGS_AND_LUGGAGE"),
+        ("Unknown", "APPAREL"),  # Default
+    ])
+    def test_category_mapping(self, fb_platform, raw, expected):
         """Test category mapping"""
-        platform = FacebookMarketplacePlatform(facebook_config)
-        
-        assert platform.map_category("Clothing") == "APPAREL"
-        assert platform.map_category("Shoes") == "SHOES"
-        assert platform.map_category("Accessories") == "ACCESSORIES"
-        assert platform.map_category("Bags") == "BAGS_AND_LUGGAGE"
-        assert platform.map_category("Unknown") == "APPAREL"  # Default
+        assert fb_platform.map_category(raw) == expected
     
-    def test_get_headers(self, facebook_config):
+    @pytest.mark.unit
+    def test_get_headers(self, fb_platform):
         """Test getting request headers"""
-        platform = FacebookMarketplacePlatform(facebook_config)
-        headers = platform.get_headers()
+        headers = fb_platform.get_headers()
         
         assert headers["Content-Type"] == "application/json"
         assert headers["Accept"] == "application/json"
         assert "User-Agent" in headers
     
-    @patch('src.platforms.facebook_marketplace.requests.get')
-    def test_health_check_success(self, mock_get, facebook_config):
-        """Test successful health check"""
-        platform = FacebookMarketplacePlatform(facebook_config)
-        
-        # Mock both API and catalog checks
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {'id': '123', 'name': 'Test'}
-        mock_get.return_value = mock_response
-        
-        result = platform.health_check()
-        assert result is True
-    
-    @patch('src.platforms.facebook_marketplace.requests.get')
-    def test_health_check_failure(self, mock_get, facebook_config):
-        """Test failed health check"""
-        platform = FacebookMarketplacePlatform(facebook_config)
-        
-        # Mock failed API response
-        mock_response = Mock()
-        mock_response.status_code = 401
-        mock_response.text = "Unauthorized"
-        mock_get.return_value = mock_response
-        
-        result = platform.health_check()
-        assert result is False
\ No newline at end of file
+    @pytest.mark.http
+    @pytest.mark.parametrize("me_status,catalog_status,expected", [
+        (200, 200, True),
+        (401, 200, False),
+        (200, 404, False),
+    ])
+    def test_health_check(self, http_mock, fb_platform, me_status, catalog_status, expected):
+        """Test health check across Graph API and catalog response statuses"""
+        http_mock.get(
+            "https://graph.facebook.com/v18.0/me",
+            json={'id': '123', 'name': 'Test'},
+            status_code=me_status
+        )
+        http_mock.get(
+            "https://graph.facebook.com/v18.0/test_catalog_id",
+            json={'id': 'test_catalog_id'},
+            status_code=catalog_status
+        )
+        
+        assert fb_platform.health_check() is expected
\ No newline at end of file
@@ -1,214 +1,179 @@
 import pytest
-import requests_mock
-from unittest.mock import patch, Mock
+from datetime import datetime, timezone
 
 from src.platforms.mercari import MercariPlatform
 from src.models.listing_data import ListingData
 
 
+@pytest.fixture
+def mercari_platform(mercari_config):
+    """Mercari platform built from the test configuration"""
+    return MercariPlatform(mercari_config)
+
+
+@pytest.fixture
+def mercari_platform_auth(mercari_platform):
+    """Mercari platform already marked as authenticated"""
+    mercari_platform.authenticated = True
+    return mercari_platform
+
+
+@pytest.fixture(scope="module")
+def expected_fetch_listings(mock_api_responses):
+    """Listings expected from the mocked fetch_listings payload, built once"""
+    listed_at = datetime(2024, 1, 15, 10, 30, tzinfo=timezone.utc)
+    return [
+        ListingData(
+            item_id=row["id"],
+            platform="mercari",
+            platform_listing_id=row["id"],
+            title=row["name"],
+            description=row["description"],
+            price=row["price"] / 100,  # Converted from cents
+            quantity=1,
+            condition="Good",
+            size=row["size"],
+            brand=row["brand"],
+            category="Clothing",
+            photos=row["photos"],
+            url=row["url"],
+            status=row["status"],
+            created_at=listed_at,
+            updated_at=listed_at,
+            extra=row
+        )
+        for row in mock_api_responses["mercari"]["fetch_listings_success"]["data"]
+    ]
+
+
 class TestMercariPlatform:
     
-    def test_init(self, mercari_config):
+    @pytest.mark.unit
+    def test_init(self, mercari_platform, mercari_urls):
         """Test MercariPlatform initialization"""
-        platform = MercariPlatform(mercari_config)
-        
-        assert platform.api_key == "test_api_key"
-        assert platform.secret == "test_secret"
-        assert platform.access_token == "test_access_token"
-        assert platform.sandbox is True
-        assert platform.base_url == "https://api-sandbox.mercari.com/v1"
-    
-    def test_authenticate_success(self, mercari_config, mock_api_responses):
-        """Test successful authentication"""
-        platform = MercariPlatform(mercari_config)
-        
-        with requests_mock.Mocker() as m:
-            m.get(
-                "https://api-sandbox.mercari.com/v1/user/profile",
-                json=mock_api_responses["mercari"]["auth_success"],
-                status_code=200
-            )
-            
-            result = platform.authenticate()
-            assert result is True
-            assert platform.authenticated is True
-    
-    def test_authenticate_failure(self, mercari_config):
-        """Test failed authentication"""
-        platform = MercariPlatform(mercari_config)
+        assert mercari_platform.api_key == "test_api_key"
+        assert mercari_platform.secret == "test_secret"
+        assert mercari_platform.access_token == "test_access_token"
+        assert mercari_platform.sandbox is True
+        assert mercari_platform.base_url == mercari_urls["base"]
+    
+    @pytest.mark.http
+    @pytest.mark.parametrize("status,expected", [(200, True), (401, False), (500, False)])
+    def test_authenticate(self, http_mock, mercari_platform, mercari_urls, mock_api_responses,
+                          status, expected):
+        """Test authentication outcome for each profile response status"""
+        http_mock.get(
+            mercari_urls["auth"],
+            json=mock_api_responses["mercari"]["auth_success"],
+            status_code=status
+        )
         
-        with requests_mock.Mocker() as m:
-            m.get(
-                "https://api-sandbox.mercari.com/v1/user/profile",
-                json={"error": "Invalid credentials"},
-                status_code=401
-            )
-            
-            result = platform.authenticate()
-            assert result is False
-            assert platform.authenticated is False
+        assert mercari_platform.authenticate() is expected
+        assert mercari_platform.authenticated is expected
     
-    def test_list_item_success(self, mercari_config, sample_listing_data, mock_api_responses):
+    @pytest.mark.http
+    def test_list_item_success(self, mock_mercari, mercari_platform_auth, sample_listing_data):
         """Test successful item listing"""
-        platform = MercariPlatform(mercari_config)
-        platform.authenticated = True
+        mock_mercari("create")
         
-        with requests_mock.Mocker() as m:
-            m.post(
-                "https://api-sandbox.mercari.com/v1/items",
-                json=mock_api_responses["mercari"]["create_listing_success"],
-                status_code=201
-            )
-            
-            listing_id = platform.list_item(sample_listing_data)
-            assert listing_id == "listing_12345"
+        listing_id = mercari_platform_auth.list_item(sample_listing_data)
+        assert listing_id == "listing_12345"
     
-    def test_list_item_not_authenticated(self, mercari_config, sample_listing_data, mock_api_responses):
+    @pytest.mark.http
+    def test_list_item_not_authenticated(self, mock_mercari, mercari_platform, sample_listing_data):
         """Test listing item when not authenticated"""
-        platform = MercariPlatform(mercari_config)
-        platform.authenticated = False
+        mercari_platform.authenticated = False
+        
+        # Mock authentication call and listing creation
+        mock_mercari("auth", "create")
         
-        with requests_mock.Mocker() as m:
-            # Mock authentication call
-            m.get(
-                "https://api-sandbox.mercari.com/v1/user/profile",
-                json=mock_api_responses["mercari"]["auth_success"],
-                status_code=200
-            )
-            
-            # Mock listing creation
-            m.post(
-                "https://api-sandbox.mercari.com/v1/items",
-                json=mock_api_responses["mercari"]["create_listing_success"],
-                status_code=201
-            )
-            
-            listing_id = platform.list_item(sample_listing_data)
-            assert listing_id == "listing_12345"
-            assert platform.authenticated is True
+        listing_id = mercari_platform.list_item(sample_listing_data)
+        assert listing_id == "listing_12345"
+        assert mercari_platform.authenticated is True
     
-    def test_list_item_invalid_data(self, mercari_config):
+    def test_list_item_invalid_data(self, mercari_platform_auth, listing_factory):
         """Test listing item with invalid data"""
-        platform = MercariPlatform(mercari_config)
-        platform.authenticated = True
-        
-        # Create invalid listing data
-        invalid_listing = ListingData(
-            item_id="",  # Invalid - empty item_id
-            platform="mercari",
-            platform_listing_id="",
-            title="",  # Invalid - empty title
-            description="Test",
-            price=0,  # Invalid - zero price
-            quantity=1,
-            condition="Good"
-        )
+        # Empty item_id and title, zero price
+        invalid_listing = listing_factory(item_id="", title="", description="Test", price=0)
         
         with pytest.raises(ValueError):
-            platform.list_item(invalid_listing)
+            mercari_platform_auth.list_item(invalid_listing)
     
-    def test_update_listing_success(self, mercari_config, sample_listing_data, mock_api_responses):
+    @pytest.mark.http
+    def test_update_listing_success(self, mock_mercari, mercari_platform_auth, sample_listing_data):
         """Test successful listing update"""
-        platform = MercariPlatform(mercari_config)
-        platform.authenticated = True
+        mock_mercari("update")
         
-        with requests_mock.Mocker() as m:
-            m.put(
-                "https://api-sandbox.mercari.com/v1/items/listing_12345",
-                json=mock_api_responses["mercari"]["update_listing_success"],
-                status_code=200
-            )
-            
-            result = platform.update_listing("listing_12345", sample_listing_data)
-            assert result["success"] is True
-            assert result["listing_id"] == "listing_12345"
+        result = mercari_platform_auth.update_listing("listing_12345", sample_listing_data)
+        assert result["success"] is True
+        assert result["listing_id"] == "listing_12345"
     
-    def test_delete_listing_success(self, mercari_config):
+    @pytest.mark.http
+    def test_delete_listing_success(self, mock_mercari, mercari_platform_auth):
         """Test successful listing deletion"""
-        platform = MercariPlatform(mercari_config)
-        platform.authenticated = True
+        mock_mercari("delete")
         
-        with requests_mock.Mocker() as m:
-            m.delete(
-                "https://api-sandbox.mercari.com/v1/items/listing_12345",
-                status_code=204
-            )
-            
-            result = platform.delete_listing("listing_12345")
-            assert result is True
+        result = mercari_platform_auth.delete_listing("listing_12345")
+        assert result is True
     
-    def test_fetch_listings_success(self, mercari_config, mock_api_responses):
+    @pytest.mark.http
+    def test_fetch_listings_success(self, mock_mercari, mercari_platform_auth, expected_fetch_listings):
         """Test successful listings fetch"""
-        platform = MercariPlatform(mercari_config)
-        platform.authenticated = True
+        mock_mercari("fetch_listings")
         
-        with requests_mock.Mocker() as m:
-            m.get(
-                "https://api-sandbox.mercari.com/v1/items",
-                json=mock_api_responses["mercari"]["fetch_listings_success"],
-                status_code=200
-            )
-            
-            listings = platform.fetch_listings()
-            assert len(listings) == 1
-            assert isinstance(listings[0], ListingData)
-            assert listings[0].title == "Supreme Box Logo Hoodie"
-            assert listings[0].price == 250.00  # Converted from cents
+        listings = mercari_platform_auth.fetch_listings()
+        assert listings == expected_fetch_listings
     
-    def test_fetch_sales_success(self, mercari_config, mock_api_responses):
+    @pytest.mark.http
+    def test_fetch_sales_success(self, mock_mercari, mercari_platform_auth):
         """Test successful sales fetch"""
-        platform = MercariPlatform(mercari_config)
-        platform.authenticated = True
+        mock_mercari("fetch_sales")
         
-        with requests_mock.Mocker() as m:
-            m.get(
-                "https://api-sandbox.mercari.com/v1/sales",
-                json=mock_api_responses["mercari"]["fetch_sales_success"],
-                status_code=200
-            )
-            
-            sales = platform.fetch_sales()
-            assert len(sales) == 1
-            assert sales[0].gross_amount == 250.00  # Converted from cents
-            assert sales[0].platform == "mercari"
+        sales = mercari_platform_auth.fetch_sales()
+        assert len(sales) == 1
+        assert sales[0].gross_amount == 250.00  # Converted from cents
+        assert sales[0].platform == "mercari"
     
-    def test_get_platform_fees(self, mercari_config):
+    @pytest.mark.unit
+    def test_get_platform_fees(self, mercari_platform):
         """Test platform fee calculation"""
-        platform = MercariPlatform(mercari_config)
-        
         sale_amount = 100.00
-        fees = platform.get_platform_fees(sale_amount)
+        fees = mercari_platform.get_platform_fees(sale_amount)
         
         # 10% platform fee + 2.9% payment fee
         expected_fees = (100.00 * 0.10) + (100.00 * 0.029)
         assert fees == expected_fees
     
-    def test_condition_mapping(self, mercari_config):
+    @pytest.mark.unit
+    @pytest.mark.parametrize("raw,expected", [
+        ("New", "new"),
+        ("Like New", "like_new"),
+        ("Excellent", "good"),
+        ("Good", "good"),
+        ("Fair", "fair"),
+        ("Poor", "poor"),
+        ("Unknown", "good"),  # Default
+    ])
+    def test_condition_mapping(self, mercari_platform, raw, expected):
         """Test condition mapping"""
-        platform = MercariPlatform(mercari_config)
-        
-        assert platform.map_condition("New") == "new"
-        assert platform.map_condition("Like New") == "like_new"
-        assert platform.map_condition("Excellent") == "good"
-        assert platform.map_condition("Good") == "good"
-        assert platform.map_condition("Fair") == "fair"
-        assert platform.map_condition("Poor") == "poor"
-        assert platform.map_condition("Unknown") == "good"  # Default
-    
-    def test_category_mapping(self, mercari_config):
+        assert mercari_platform.map_condition(raw) == expected
+    
+    @pytest.mark.unit
+    @pytest.mark.parametrize("raw,expected", [
+        ("Clothing", "clothing"),
+        ("Shoes", "shoes"),
+        ("Accessories", "accessories"),
+        ("Bags", "bags"),
+        ("Unknown", "other"),  # Default
+    ])
+    def test_category_mapping(self, mercari_platform, raw, expected):
         """Test category mapping"""
-        platform = MercariPlatform(mercari_config)
-        
-        assert platform.map_category("Clothing") == "clothing"
-        assert platform.map_category("Shoes") == "shoes"
-        assert platform.map_category("Accessories") == "accessories"
-        assert platform.map_category("Bags") == "bags"
-        assert platform.map_category("Unknown") == "other"  # Default
+        assert mercari_platform.map_category(raw) == expected
     
-    def test_get_headers(self, mercari_config):
+    @pytest.mark.unit
+    def test_get_headers(self, mercari_platform):
         """Test getting request headers"""
-        platform = MercariPlatform(mercari_config)
-        headers = platform.get_headers()
+        headers = mercari_platform.get_headers()
         
         assert "X-API-Key" in headers
         assert headers["X-API-Key"] == "test_api_key"
@@ -216,30 +181,15 @@ class TestMercariPlatform:
         assert headers["Accept"] == "application/json"
         assert "User-Agent" in headers
     
-    def test_health_check_success(self, mercari_config, mock_api_responses):
-        """Test successful health check"""
-        platform = MercariPlatform(mercari_config)
-        
-        with requests_mock.Mocker() as m:
-            m.get(
-                "https://api-sandbox.mercari.com/v1/user/profile",
-                json=mock_api_responses["mercari"]["auth_success"],
-                status_code=200
-            )
-            
-            result = platform.health_check()
-            assert result is True
-    
-    def test_health_check_failure(self, mercari_config):
-        """Test failed health check"""
-        platform = MercariPlatform(mercari_config)
+    @pytest.mark.http
+    @pytest.mark.parametrize("status,expected", [(200, True), (401, False), (503, False)])
+    def test_health_check(self, http_mock, mercari_platform, mercari_urls, mock_api_responses,
+                          status, expected):
+        """Test health check outcome for each profile response status"""
+        http_mock.get(
+            mercari_urls["auth"],
+            json=mock_api_responses["mercari"]["auth_success"],
+            status_code=status
+        )
         
-        with requests_mock.Mocker() as m:
-            m.get(
-                "https://api-sandbox.mercari.com/v1/user/profile",
-                json={"error": "Service unavailable"},
-                status_code=503
-            )
-            
-            result = platform.health_check()
-            assert result is False
\ No newline at end of file
+        assert mercari_platform.health_check() is expected
\ No newline at end of file
@@ -1,26 +1,36 @@
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+import requests
+from unittest.mock import Mock, patch
 
 from src.platforms.vinted import VintedPlatform
 from src.models.listing_data import ListingData
 from src.utils.oauth_manager import VintedOAuthManager
 
 
+VINTED_BASE = "https://api.vinted.com/v1"
+
+
+@pytest.fixture(scope="class")
+def vinted_platform(vinted_config):
+    """Shared Vinted platform for tests that only read its state"""
+    return VintedPlatform(vinted_config)
+
+
 class TestVintedPlatform:
     
-    def test_init(self, vinted_config):
+    @pytest.mark.unit
+    def test_init(self, vinted_platform):
         """Test VintedPlatform initialization"""
-        platform = VintedPlatform(vinted_config)
-        
-        assert platform.client_id == "test_client_id"
-        assert platform.client_secret == "test_client_secret"
-        assert platform.access_token == "test_access_token"
-        assert platform.refresh_token == "test_refresh_token"
-        assert platform.base_url == "https://api.vinted.com/v1"
-        assert isinstance(platform.oauth_manager, VintedOAuthManager)
+        assert vinted_platform.client_id == "test_client_id"
+        assert vinted_platform.client_secret == "test_client_secret"
+        assert vinted_platform.access_token == "test_access_token"
+        assert vinted_platform.refresh_token == "test_refresh_token"
+        assert vinted_platform.base_url == VINTED_BASE
+        assert isinstance(vinted_platform.oauth_manager, VintedOAuthManager)
+        assert isinstance(vinted_platform._session, requests.Session)
     
-    @patch('src.platforms.vinted.requests.get')
-    def test_authenticate_success(self, mock_get, vinted_config):
+    @pytest.mark.http
+    def test_authenticate_success(self, http_mock, vinted_config):
         """Test successful authentication"""
         platform = VintedPlatform(vinted_config)
         
@@ -29,22 +39,19 @@ class TestVintedPlatform:
         platform.oauth_manager.get_authorization_header = Mock(return_value={'Authorization': 'Bearer test_token'})
         
         # Mock API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        http_mock.get(f"{VINTED_BASE}/user/profile", json={
             'user': {
                 'id': 123,
                 'login': 'test_user'
             }
-        }
-        mock_get.return_value = mock_response
+        }, status_code=200)
         
         result = platform.authenticate()
         assert result is True
         assert platform.authenticated is True
     
-    @patch('src.platforms.vinted.requests.get')
-    def test_authenticate_invalid_token(self, mock_get, vinted_config):
+    @pytest.mark.http
+    def test_authenticate_invalid_token(self, http_mock, vinted_config):
         """Test authentication with invalid token"""
         platform = VintedPlatform(vinted_config)
         
@@ -54,39 +61,44 @@ class TestVintedPlatform:
         result = platform.authenticate()
         assert result is False
         assert platform.authenticated is False
+        assert http_mock.call_count == 0
     
-    @patch('src.platforms.vinted.requests.post')
-    def test_list_item_success(self, mock_post, vinted_config, sample_listing_data):
+    @pytest.mark.http
+    def test_list_item_success(self, http_mock, vinted_config, sample_listing_data):
         """Test successful item listing"""
         platform = VintedPlatform(vinted_config)
         platform.authenticated = True
         
-        # Mock photo upload
-        platform._upload_photos = Mock(return_value=[1, 2, 3])
-        platform._get_category_id = Mock(return_value=1)
-        platform._get_brand_id = Mock(return_value=101)
-        platform._get_size_id = Mock(return_value=201)
-        platform._get_condition_id = Mock(return_value=3)
-        
         # Mock OAuth manager
         platform.oauth_manager.get_authorization_header = Mock(return_value={'Authorization': 'Bearer test_token'})
         
         # Mock API response
-        mock_response = Mock()
-        mock_response.status_code = 201
-        mock_response.json.return_value = {
+        http_mock.post(f"{VINTED_BASE}/items", json={
             'item': {
                 'id': 12345,
                 'title': 'Supreme Box Logo Hoodie'
             }
-        }
-        mock_post.return_value = mock_response
+        }, status_code=201)
+        
+        # Mock photo upload and catalog ID lookups
+        with patch.multiple(platform,
+                            _upload_photos=Mock(return_value=[1, 2, 3]),
+                            _get_category_id=Mock(return_value=1),
+                            _get_brand_id=Mock(return_value=101),
+                            _get_size_id=Mock(return_value=201),
+                            _get_condition_id=Mock(return_value=3)):
+            listing_id = platform.list_item(sample_listing_data)
         
-        listing_id = platform.list_item(sample_listing_data)
         assert listing_id == "12345"
+        payload = http_mock.last_request.json()
+        assert payload["photo_ids"] == [1, 2, 3]
+        assert payload["category_id"] == 1
+        assert payload["brand_id"] == 101
+        assert payload["size_id"] == 201
+        assert payload["item_condition_id"] == 3
     
-    @patch('src.platforms.vinted.requests.get')
-    def test_upload_single_photo(self, mock_get, vinted_config):
+    @pytest.mark.http
+    def test_upload_single_photo(self, http_mock, vinted_config):
         """Test photo upload functionality"""
         platform = VintedPlatform(vinted_config)
         platform.authenticated = True
@@ -95,27 +107,20 @@ class TestVintedPlatform:
         platform.oauth_manager.get_authorization_header = Mock(return_value={'Authorization': 'Bearer test_token'})
         
         # Mock photo download
-        mock_photo_response = Mock()
-        mock_photo_response.status_code = 200
-        mock_photo_response.content = b'fake_image_data'
+        http_mock.get("https://example.com/photo.jpg", content=b'fake_image_data', status_code=200)
         
         # Mock photo upload response
-        mock_upload_response = Mock()
-        mock_upload_response.status_code = 201
-        mock_upload_response.json.return_value = {
+        http_mock.post(f"{VINTED_BASE}/photos", json={
             'photo': {
                 'id': 123
             }
-        }
+        }, status_code=201)
         
-        with patch('src.platforms.vinted.requests.post', return_value=mock_upload_response):
-            mock_get.return_value = mock_photo_response
-            
-            photo_id = platform._upload_single_photo("https://example.com/photo.jpg")
-            assert photo_id == 123
+        photo_id = platform._upload_single_photo("https://example.com/photo.jpg")
+        assert photo_id == 123
     
-    @patch('src.platforms.vinted.requests.put')
-    def test_update_listing_success(self, mock_put, vinted_config, sample_listing_data):
+    @pytest.mark.http
+    def test_update_listing_success(self, http_mock, vinted_config, sample_listing_data):
         """Test successful listing update"""
         platform = VintedPlatform(vinted_config)
         platform.authenticated = True
@@ -124,22 +129,19 @@ class TestVintedPlatform:
         platform.oauth_manager.get_authorization_header = Mock(return_value={'Authorization': 'Bearer test_token'})
         
         # Mock API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        http_mock.put(f"{VINTED_BASE}/items/12345", json={
             'item': {
                 'id': 12345,
                 'updated': True
             }
-        }
-        mock_put.return_value = mock_response
+        }, status_code=200)
         
         result = platform.update_listing("12345", sample_listing_data)
         assert result["success"] is True
         assert result["listing_id"] == "12345"
     
-    @patch('src.platforms.vinted.requests.delete')
-    def test_delete_listing_success(self, mock_delete, vinted_config):
+    @pytest.mark.http
+    def test_delete_listing_success(self, http_mock, vinted_config):
         """Test successful listing deletion"""
         platform = VintedPlatform(vinted_config)
         platform.authenticated = True
@@ -148,15 +150,13 @@ class TestVintedPlatform:
         platform.oauth_manager.get_authorization_header = Mock(return_value={'Authorization': 'Bearer test_token'})
         
         # Mock API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_delete.return_value = mock_response
+        http_mock.delete(f"{VINTED_BASE}/items/12345", status_code=200)
         
         result = platform.delete_listing("12345")
         assert result is True
     
-    @patch('src.platforms.vinted.requests.get')
-    def test_fetch_listings_success(self, mock_get, vinted_config):
+    @pytest.mark.http
+    def test_fetch_listings_success(self, http_mock, vinted_config):
         """Test successful listings fetch"""
         platform = VintedPlatform(vinted_config)
         platform.authenticated = True
@@ -165,9 +165,7 @@ class TestVintedPlatform:
         platform.oauth_manager.get_authorization_header = Mock(return_value={'Authorization': 'Bearer test_token'})
         
         # Mock API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        http_mock.get(f"{VINTED_BASE}/items", json={
             'items': [
                 {
                     'id': 12345,
@@ -185,8 +183,7 @@ class TestVintedPlatform:
                     'updated_at_ts': 1642248600
                 }
             ]
-        }
-        mock_get.return_value = mock_response
+        }, status_code=200)
         
         listings = platform.fetch_listings()
         assert len(listings) == 1
@@ -195,8 +192,8 @@ class TestVintedPlatform:
         assert listings[0].price == 250.0
         assert listings[0].platform == "vinted"
     
-    @patch('src.platforms.vinted.requests.get')
-    def test_fetch_sales_success(self, mock_get, vinted_config):
+    @pytest.mark.http
+    def test_fetch_sales_success(self, http_mock, vinted_config):
         """Test successful sales fetch"""
         platform = VintedPlatform(vinted_config)
         platform.authenticated = True
@@ -205,9 +202,7 @@ class TestVintedPlatform:
         platform.oauth_manager.get_authorization_header = Mock(return_value={'Authorization': 'Bearer test_token'})
         
         # Mock API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        http_mock.get(f"{VINTED_BASE}/transactions", json={
             'transactions': [
                 {
                     'id': 67890,
@@ -220,75 +215,76 @@ class TestVintedPlatform:
                     }
                 }
             ]
-        }
-        mock_get.return_value = mock_response
+        }, status_code=200)
         
         sales = platform.fetch_sales()
         assert len(sales) == 1
         assert sales[0].gross_amount == 250.0
         assert sales[0].platform == "vinted"
     
-    def test_get_platform_fees(self, vinted_config):
+    @pytest.mark.unit
+    @pytest.mark.parametrize("sale_amount,expected", [
+        (100.0, 8.0),  # 3% buyer protection + 5% platform fee
+        (50.0, 4.0),
+        (0.0, 0.0),
+        (1000.0, 80.0),
+    ])
+    def test_get_platform_fees(self, vinted_platform, sale_amount, expected):
         """Test platform fee calculation"""
-        platform = VintedPlatform(vinted_config)
-        
-        sale_amount = 100.00
-        fees = platform.get_platform_fees(sale_amount)
-        
-        # 3% buyer protection + 5% platform fee
-        expected_fees = (100.00 * 0.03) + (100.00 * 0.05)
-        assert fees == expected_fees
+        assert vinted_platform.get_platform_fees(sale_amount) == pytest.approx(expected)
     
-    def test_condition_mapping(self, vinted_config):
+    @pytest.mark.unit
+    @pytest.mark.parametrize("raw,expected", [
+        ("New", "brand_new_with_tag"),
+        ("Like New", "brand_new_without_tag"),
+        ("Excellent", "very_good"),
+        ("Good", "good"),
+        ("Fair", "satisfactory"),
+        ("Poor", "poor"),
+        ("Unknown", "good"),  # Default
+    ])
+    def test_condition_mapping(self, vinted_platform, raw, expected):
         """Test condition mapping"""
-        platform = VintedPlatform(vinted_config)
-        
-        assert platform.map_condition("New") == "brand_new_with_tag"
-        assert platform.map_condition("Like New") == "brand_new_without_tag"
-        assert platform.map_condition("Excellent") == "very_good"
-        assert platform.map_condition("Good") == "good"
-        assert platform.map_condition("Fair") == "satisfactory"
-        assert platform.map_condition("Poor") == "poor"
-        assert platform.map_condition("Unknown") == "good"  # Default
+        assert vinted_platform.map_condition(raw) == expected
     
-    def test_category_mapping(self, vinted_config):
+    @pytest.mark.unit
+    @pytest.mark.parametrize("raw,expected", [
+        ("Clothing", "clothing"),
+        ("Shoes", "shoes"),
+        ("Accessories", "accessories"),
+        ("Bags", "bags"),
+        ("Unknown", "clothing"),  # Default
+    ])
+    def test_category_mapping(self, vinted_platform, raw, expected):
         """Test category mapping"""
-        platform = VintedPlatform(vinted_config)
-        
-        assert platform.map_category("Clothing") == "clothing"
-        assert platform.map_category("Shoes") == "shoes"
-        assert platform.map_category("Accessories") == "accessories"
-        assert platform.map_category("Bags") == "bags"
-        assert platform.map_category("Unknown") == "clothing"  # Default
+        assert vinted_platform.map_category(raw) == expected
     
-    def test_get_headers(self, vinted_config):
+    @pytest.mark.unit
+    def test_get_headers(self, vinted_platform):
         """Test getting request headers"""
-        platform = VintedPlatform(vinted_config)
-        headers = platform.get_headers()
+        headers = vinted_platform.get_headers()
         
         assert headers["Content-Type"] == "application/json"
         assert headers["Accept"] == "application/json"
         assert headers["Accept-Language"] == "en"
         assert "User-Agent" in headers
     
-    def test_parse_date_timestamp(self, vinted_config):
+    @pytest.mark.unit
+    def test_parse_date_timestamp(self, vinted_platform):
         """Test parsing timestamp to datetime"""
-        platform = VintedPlatform(vinted_config)
-        
         timestamp = 1642248600  # 2022-01-15 10:30:00
-        parsed_date = platform._parse_date(timestamp)
+        parsed_date = vinted_platform._parse_date(timestamp)
         
         assert parsed_date is not None
         assert parsed_date.year == 2022
         assert parsed_date.month == 1
         assert parsed_date.day == 15
     
-    def test_parse_date_string(self, vinted_config):
+    @pytest.mark.unit
+    def test_parse_date_string(self, vinted_platform):
         """Test parsing ISO string to datetime"""
-        platform = VintedPlatform(vinted_config)
-        
         date_string = "2024-01-15T10:30:00Z"
-        parsed_date = platform._parse_date(date_string)
+        parsed_date = vinted_platform._parse_date(date_string)
         
         assert parsed_date is not None
         assert parsed_date.year == 2024
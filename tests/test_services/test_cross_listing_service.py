@@ -1,30 +1,37 @@
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, MagicMock
 from datetime import datetime, timedelta
 
 from src.services.cross_listing_service import CrossListingService
 from src.models.listing_data import ListingData
 from src.models.sale_data import SaleData
+import src.services.cross_listing_service as cross_listing_service
+
+
+SALE_DATE = datetime(2024, 6, 15)
+
+
+@pytest.fixture(autouse=True)
+def config_manager(monkeypatch, test_config):
+    """Replace ConfigManager so every service loads the test configuration"""
+    fake = MagicMock()
+    fake.return_value.load_config.return_value = test_config
+    monkeypatch.setattr(cross_listing_service, "ConfigManager", fake)
+    return fake
 
 
 class TestCrossListingService:
     
-    @patch('src.services.cross_listing_service.ConfigManager')
-    def test_init(self, mock_config_manager, test_config):
+    def test_init(self):
         """Test CrossListingService initialization"""
-        mock_config_manager.return_value.load_config.return_value = test_config
-        
         service = CrossListingService()
         
         assert len(service.platforms) == 1  # Only Mercari enabled in test config
         assert "mercari" in service.platforms
         assert service.max_workers == 5
     
-    @patch('src.services.cross_listing_service.ConfigManager')
-    def test_create_cross_listing_success(self, mock_config_manager, test_config, sample_listing_data):
+    def test_create_cross_listing_success(self, sample_listing_data):
         """Test successful cross-listing creation"""
-        mock_config_manager.return_value.load_config.return_value = test_config
-        
         service = CrossListingService()
         
         # Mock the platform
@@ -40,11 +47,8 @@ class TestCrossListingService:
         assert len(result["failed_platforms"]) == 0
         assert result["item_id"] == sample_listing_data.item_id
     
-    @patch('src.services.cross_listing_service.ConfigManager')
-    def test_create_cross_listing_from_dict(self, mock_config_manager, test_config, sample_listing_data):
+    def test_create_cross_listing_from_dict(self, sample_listing_dict):
         """Test cross-listing creation from dictionary data"""
-        mock_config_manager.return_value.load_config.return_value = test_config
-        
         service = CrossListingService()
         
         # Mock the platform
@@ -52,18 +56,13 @@ class TestCrossListingService:
         mock_platform.list_item.return_value = "listing_12345"
         service.platforms["mercari"] = mock_platform
         
-        # Convert to dict and test
-        listing_dict = sample_listing_data.to_dict()
-        result = service.create_cross_listing(listing_dict, ["mercari"])
+        result = service.create_cross_listing(sample_listing_dict, ["mercari"])
         
         assert result["success"] is True
         assert result["listing_ids"]["mercari"] == "listing_12345"
     
-    @patch('src.services.cross_listing_service.ConfigManager')
-    def test_create_cross_listing_invalid_data(self, mock_config_manager, test_config):
+    def test_create_cross_listing_invalid_data(self):
         """Test cross-listing creation with invalid data"""
-        mock_config_manager.return_value.load_config.return_value = test_config
-        
         service = CrossListingService()
         
         # Create invalid listing data
@@ -85,11 +84,8 @@ class TestCrossListingService:
         assert len(result["successful_platforms"]) == 0
         assert "mercari" in result["failed_platforms"]
     
-    @patch('src.services.cross_listing_service.ConfigManager')
-    def test_create_cross_listing_no_platforms(self, mock_config_manager, test_config, sample_listing_data):
+    def test_create_cross_listing_no_platforms(self, sample_listing_data):
         """Test cross-listing creation with no available platforms"""
-        mock_config_manager.return_value.load_config.return_value = test_config
-        
         service = CrossListingService()
         
         result = service.create_cross_listing(sample_listing_data, ["invalid_platform"])
@@ -99,12 +95,11 @@ class TestCrossListingService:
         assert len(result["successful_platforms"]) == 0
         assert "invalid_platform" in result["failed_platforms"]
     
-    @patch('src.services.cross_listing_service.ConfigManager')
-    def test_create_cross_listing_partial_failure(self, mock_config_manager, test_config, sample_listing_data):
+    def test_create_cross_listing_partial_failure(self, config_manager, mutable_test_config, sample_listing_data):
         """Test cross-listing creation with partial failure"""
         # Add vinted to test config as enabled
-        test_config["platforms"]["vinted"]["enabled"] = True
-        mock_config_manager.return_value.load_config.return_value = test_config
+        mutable_test_config["platforms"]["vinted"]["enabled"] = True
+        config_manager.return_value.load_config.return_value = mutable_test_config
         
         service = CrossListingService()
         
@@ -125,11 +120,8 @@ class TestCrossListingService:
         assert "mercari" in result["successful_platforms"]
         assert "vinted" in result["failed_platforms"]
     
-    @patch('src.services.cross_listing_service.ConfigManager')
-    def test_update_cross_listing(self, mock_config_manager, test_config):
+    def test_update_cross_listing(self):
         """Test cross-listing update"""
-        mock_config_manager.return_value.load_config.return_value = test_config
-        
         service = CrossListingService()
         
         # Mock platform listings lookup
@@ -147,11 +139,8 @@ class TestCrossListingService:
         assert "mercari" in result["successful_platforms"]
         assert len(result["failed_platforms"]) == 0
     
-    @patch('src.services.cross_listing_service.ConfigManager')
-    def test_delete_cross_listing(self, mock_config_manager, test_config):
+    def test_delete_cross_listing(self):
         """Test cross-listing deletion"""
-        mock_config_manager.return_value.load_config.return_value = test_config
-        
         service = CrossListingService()
         
         # Mock platform listings lookup
@@ -168,16 +157,13 @@ class TestCrossListingService:
         assert "mercari" in result["successful_platforms"]
         assert len(result["failed_platforms"]) == 0
     
-    @patch('src.services.cross_listing_service.ConfigManager')
-    def test_sync_all_listings(self, mock_config_manager, test_config):
+    def test_sync_all_listings(self):
         """Test syncing all listings"""
-        mock_config_manager.return_value.load_config.return_value = test_config
-        
         service = CrossListingService()
         
         # Mock the platform
         mock_platform = Mock()
-        mock_platform.fetch_listings.return_value = [Mock(), Mock(), Mock()]  # 3 listings
+        mock_platform.fetch_listings.return_value = [object()] * 3  # only the count is used
         service.platforms["mercari"] = mock_platform
         
         result = service.sync_all_listings()
@@ -187,11 +173,8 @@ class TestCrossListingService:
         assert result["total_conflicts"] == 0
         assert "mercari" in result["platform_results"]
     
-    @patch('src.services.cross_listing_service.ConfigManager')
-    def test_get_sales_report(self, mock_config_manager, test_config):
+    def test_get_sales_report(self):
         """Test generating sales report"""
-        mock_config_manager.return_value.load_config.return_value = test_config
-        
         service = CrossListingService()
         
         # Mock sales data
@@ -200,7 +183,7 @@ class TestCrossListingService:
                 sale_id="sale_001",
                 listing_id="listing_001",
                 buyer_info={"username": "buyer1"},
-                sale_date=datetime.now(),
+                sale_date=SALE_DATE,
                 gross_amount=100.00,
                 fees=15.00,
                 net_amount=85.00,
@@ -210,7 +193,7 @@ class TestCrossListingService:
                 sale_id="sale_002",
                 listing_id="listing_002",
                 buyer_info={"username": "buyer2"},
-                sale_date=datetime.now(),
+                sale_date=SALE_DATE,
                 gross_amount=200.00,
                 fees=30.00,
                 net_amount=170.00,
@@ -233,12 +216,12 @@ class TestCrossListingService:
         assert result["summary"]["average_sale"] == 150.00
         assert "mercari" in result["platform_breakdown"]
         assert result["platform_breakdown"]["mercari"]["sales_count"] == 2
+        
+        start_date, end_date = mock_platform.fetch_sales.call_args[0][0]
+        assert end_date - start_date == timedelta(days=30)
     
-    @patch('src.services.cross_listing_service.ConfigManager')
-    def test_get_sales_report_custom_date_range(self, mock_config_manager, test_config):
+    def test_get_sales_report_custom_date_range(self):
         """Test generating sales report with custom date range"""
-        mock_config_manager.return_value.load_config.return_value = test_config
-        
         service = CrossListingService()
         
         # Mock the platform
@@ -247,8 +230,8 @@ class TestCrossListingService:
         service.platforms["mercari"] = mock_platform
         
         # Test with custom date range
-        start_date = datetime.now() - timedelta(days=7)
-        end_date = datetime.now()
+        end_date = SALE_DATE
+        start_date = end_date - timedelta(days=7)
         date_range = (start_date, end_date)
         
         result = service.get_sales_report(date_range)
@@ -257,11 +240,8 @@ class TestCrossListingService:
         assert result["date_range"]["end"] == end_date.isoformat()
         assert result["summary"]["total_sales"] == 0
     
-    @patch('src.services.cross_listing_service.ConfigManager')
-    def test_health_check(self, mock_config_manager, test_config):
+    def test_health_check(self):
         """Test health check"""
-        mock_config_manager.return_value.load_config.return_value = test_config
-        
         service = CrossListingService()
         
         # Mock the platform
@@ -276,11 +256,8 @@ class TestCrossListingService:
         assert "duration" in result
         assert "timestamp" in result
     
-    @patch('src.services.cross_listing_service.ConfigManager')
-    def test_health_check_with_failure(self, mock_config_manager, test_config):
+    def test_health_check_with_failure(self):
         """Test health check with platform failure"""
-        mock_config_manager.return_value.load_config.return_value = test_config
-        
         service = CrossListingService()
         
         # Mock the platform with failure
@@ -0,0 +1,308 @@
+import pytest
+import json
+import logging.handlers
+import queue
+import time
+from datetime import datetime
+
+from src.utils.logger import (
+    StructuredLogger, BufferedRotatingFileHandler, DeferredQueueHandler, JsonFormatter,
+    TokenBucket, get_logger, _parse_size
+)
+
+
+@pytest.fixture
+def log_config(tmp_path):
+    """Logger configuration writing to a temporary file"""
+    return {
+        "level": "INFO",
+        "file": str(tmp_path / "test.log")
+    }
+
+
+def read_log_entries(path):
+    """Read JSON log entries from a log file"""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class TestStructuredLogger:
+
+    def test_uses_queue_handler(self, log_config):
+        """Test that the logger only enqueues records"""
+        logger = StructuredLogger("test_queue_handler", log_config)
+
+        assert len(logger.logger.handlers) == 1
+        assert isinstance(logger.logger.handlers[0], DeferredQueueHandler)
+
+        logger.close()
+
+    def test_close_flushes_pending_records(self, log_config):
+        """Test that closing the logger writes queued records to file"""
+        logger = StructuredLogger("test_close_flush", log_config)
+
+        logger.log_performance("sync", 2.0, items_count=10, platform="mercari")
+        logger.close()
+
+        entries = read_log_entries(log_config["file"])
+        assert len(entries) == 1
+        assert entries[0]["event_type"] == "performance"
+        assert entries[0]["items_per_second"] == 5.0
+        assert entries[0]["message"] == "Performance: sync took 2.000s for 10 items"
+        assert datetime.fromisoformat(entries[0]["timestamp"])
+
+    def test_reconfigure_stops_previous_listener(self, log_config):
+        """Test that re-creating a logger with the same name replaces the listener"""
+        first = StructuredLogger("test_reconfigure", log_config)
+        second = StructuredLogger("test_reconfigure", log_config)
+
+        assert not first.is_running
+        assert second.is_running
+
+        second.close()
+        assert not second.is_running
+
+    def test_disabled_level_skips_record(self, log_config):
+        """Test that records below the logger level are not built or written"""
+        log_config["level"] = "WARNING"
+        logger = StructuredLogger("test_disabled_level", log_config)
+
+        logger.log_performance("sync", 1.0)
+        logger.log_sync_operation("fetch", "mercari", items_processed=5, items_failed=1)
+        logger.close()
+
+        entries = read_log_entries(log_config["file"])
+        assert [entry["event_type"] for entry in entries] == ["sync_operation"]
+
+    def test_snapshots_arguments_when_queued(self):
+        """Test that changing arguments after the logging call does not alter the queued record"""
+        log_queue = queue.Queue()
+        handler = DeferredQueueHandler(log_queue)
+        context = {"item_id": "item-1"}
+        error = ValueError("bad price")
+        record = logging.makeLogRecord({
+            "msg": "Error: %s",
+            "args": (error,),
+            "structured_data": {"event_type": "error", "context": context}
+        })
+
+        handler.emit(record)
+        context["item_id"] = "item-2"
+        error.args = ("changed",)
+
+        entry = json.loads(JsonFormatter().format(log_queue.get_nowait()))
+        assert entry["message"] == "Error: bad price"
+        assert entry["context"] == {"item_id": "item-1"}
+
+    def test_sanitize_url(self, log_config):
+        """Test masking of sensitive query parameters"""
+        logger = StructuredLogger("test_sanitize_url", log_config)
+
+        url = "https://api.example.com/items?api_key=abc&page=2&client_secret=xyz&Access_Token=123"
+        sanitized = logger._sanitize_url(url)
+
+        assert sanitized == "https://api.example.com/items?api_key=***&page=2&client_secret=***&Access_Token=***"
+        assert logger._sanitize_url("https://api.example.com/items") == "https://api.example.com/items"
+
+        logger.close()
+
+
+class TestParseSize:
+
+    @pytest.mark.parametrize("size,expected", [
+        ("10MB", 10 * 1024 * 1024),
+        ("512 kb", 512 * 1024),
+        ("1GB", 1024 ** 3),
+        ("2048", 2048),
+        ("64B", 64),
+        (4096, 4096),
+    ])
+    def test_parse_size(self, size, expected):
+        """Test parsing size strings to bytes"""
+        assert _parse_size(size) == expected
+
+    def test_parse_size_invalid(self):
+        """Test that malformed sizes are rejected"""
+        with pytest.raises(ValueError):
+            _parse_size("ten megabytes")
+
+
+class TestBufferedRotatingFileHandler:
+
+    def test_buffers_until_flush(self, tmp_path):
+        """Test that records stay buffered until flushed"""
+        log_file = tmp_path / "buffered.log"
+        handler = BufferedRotatingFileHandler(str(log_file), flush_interval=60)
+        record = logging.makeLogRecord({"msg": "buffered message"})
+
+        handler.emit(record)
+        handler.emit(record)
+        assert log_file.read_text() == ""
+
+        handler.flush()
+        assert log_file.read_text().count("buffered message") == 2
+
+        handler.close()
+
+    def test_writer_thread_flushes_full_buffer(self, tmp_path):
+        """Test that the writer thread flushes once the buffer fills"""
+        log_file = tmp_path / "buffered.log"
+        handler = BufferedRotatingFileHandler(str(log_file), buffer_size=16, flush_interval=60)
+        record = logging.makeLogRecord({"msg": "x" * 20})
+
+        handler.emit(record)
+        for _ in range(100):
+            if log_file.read_text():
+                break
+            time.sleep(0.01)
+
+        assert log_file.read_text() == "x" * 20 + "\n"
+
+        handler.close()
+
+    def test_writer_thread_flushes_after_interval(self, tmp_path):
+        """Test that a partial buffer is written flush_interval after its first record"""
+        log_file = tmp_path / "buffered.log"
+        handler = BufferedRotatingFileHandler(str(log_file), flush_interval=0.05)
+        record = logging.makeLogRecord({"msg": "late message"})
+
+        time.sleep(0.1)
+        handler.emit(record)
+        assert log_file.read_text() == ""
+
+        for _ in range(100):
+            if log_file.read_text():
+                break
+            time.sleep(0.01)
+
+        assert log_file.read_text() == "late message\n"
+
+        handler.close()
+
+    def test_rollover_on_max_bytes(self, tmp_path):
+        """Test that the file rotates once maxBytes would be exceeded"""
+        log_file = tmp_path / "rotating.log"
+        handler = BufferedRotatingFileHandler(str(log_file), maxBytes=50, backupCount=1)
+        record = logging.makeLogRecord({"msg": "x" * 30})
+
+        handler.emit(record)
+        handler.emit(record)
+        handler.close()
+
+        assert (tmp_path / "rotating.log.1").read_text() == "x" * 30 + "\n"
+        assert log_file.read_text() == "x" * 30 + "\n"
+
+
+class TestJsonFormatter:
+
+    def test_format_record(self):
+        """Test JSON formatting of a record with structured data"""
+        record = logging.makeLogRecord({
+            "name": "test",
+            "levelname": "INFO",
+            "msg": "hello %s",
+            "args": ("world",),
+            "created": 1705314600.25,
+            "structured_data": {"event_type": "test"}
+        })
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert entry["message"] == "hello world"
+        assert entry["event_type"] == "test"
+        assert entry["timestamp"] == datetime.fromtimestamp(1705314600.25).isoformat()
+
+    def test_format_whole_second(self):
+        """Test that whole-second timestamps match datetime.isoformat"""
+        record = logging.makeLogRecord({"msg": "tick", "created": 1705314600.0})
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert entry["timestamp"] == datetime.fromtimestamp(1705314600).isoformat()
+        assert "event_type" not in entry
+
+
+class TestLogThrottling:
+
+    def test_token_bucket(self):
+        """Test that the bucket rejects events once drained"""
+        bucket = TokenBucket(rate=1, capacity=2)
+
+        assert bucket.consume() is True
+        assert bucket.consume() is True
+        assert bucket.consume() is False
+
+    def test_suppress_duplicate_api_calls(self, log_config):
+        """Test duplicate success logs are dropped while failures pass"""
+        log_config["suppress_duplicates"] = True
+        logger = StructuredLogger("test_suppress_duplicates", log_config)
+
+        for _ in range(3):
+            logger.log_api_call("mercari", "GET", "https://example.com/items", 0.1, True, 200)
+        for _ in range(2):
+            logger.log_api_call("mercari", "GET", "https://example.com/items", 0.1, False, 500)
+        logger.close()
+
+        entries = read_log_entries(log_config["file"])
+        assert [entry["success"] for entry in entries] == [True, False, False]
+
+    def test_rate_limited_record_is_not_marked_duplicate(self, log_config):
+        """Test that a success dropped by the rate limiter can still be logged later"""
+        log_config["suppress_duplicates"] = True
+        log_config["max_logs_per_sec"] = 1
+        logger = StructuredLogger("test_rate_limited_duplicate", log_config)
+
+        logger.log_api_call("mercari", "GET", "https://example.com/items", 0.1, True, 200)
+        logger.log_api_call("mercari", "POST", "https://example.com/items", 0.1, True, 201)
+        logger._bucket = TokenBucket(rate=1)
+        logger.log_api_call("mercari", "POST", "https://example.com/items", 0.1, True, 201)
+        logger.close()
+
+        entries = read_log_entries(log_config["file"])
+        assert [entry["method"] for entry in entries] == ["GET", "POST"]
+
+    def test_no_rate_limit_by_default(self, log_config):
+        """Test that success logs are not throttled unless max_logs_per_sec is set"""
+        logger = StructuredLogger("test_no_rate_limit", log_config)
+
+        for _ in range(5):
+            logger.log_api_call("mercari", "GET", "https://example.com/items", 0.1, True, 200)
+        logger.close()
+
+        assert len(read_log_entries(log_config["file"])) == 5
+
+    def test_rate_limit_when_configured(self, log_config):
+        """Test that max_logs_per_sec caps successful API call logs"""
+        log_config["max_logs_per_sec"] = 2
+        logger = StructuredLogger("test_rate_limit", log_config)
+
+        for _ in range(5):
+            logger.log_api_call("mercari", "GET", "https://example.com/items", 0.1, True, 200)
+        logger.close()
+
+        assert len(read_log_entries(log_config["file"])) == 2
+
+
+class TestGetLogger:
+
+    def test_reuses_instance(self):
+        """Test that get_logger returns the same instance for a name"""
+        first = get_logger("test_get_logger_reuse")
+        second = get_logger("test_get_logger_reuse")
+
+        assert first is second
+        assert len(first.logger.handlers) == 1
+
+        first.close()
+
+    def test_rebuilds_after_close(self):
+        """Test that a closed logger is replaced with a fresh instance"""
+        first = get_logger("test_get_logger_closed")
+        first.close()
+
+        second = get_logger("test_get_logger_closed")
+
+        assert second is not first
+        assert second.is_running
+
+        second.close()
@@ -1,35 +1,57 @@
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import time
+import hmac
+import hashlib
+from urllib.parse import urlparse, parse_qs
 
 from src.utils.oauth_manager import OAuthTokenManager, VintedOAuthManager
 
 
+TOKEN_URL = "https://example.com/oauth/token"
+VINTED_TOKEN_URL = "https://www.vinted.com/oauth/token"
+
+CLIENT_KWARGS = {"client_id": "test_client_id", "client_secret": "test_client_secret"}
+MANAGER_KWARGS = {**CLIENT_KWARGS, "token_endpoint": TOKEN_URL}
+
+# Expected signature for the payload and secret, computed once at import
+WEBHOOK_PAYLOAD = b"test_payload"
+WEBHOOK_SIGNATURE = hmac.new(b"test_secret", WEBHOOK_PAYLOAD, hashlib.sha256).hexdigest()
+
+
+def prime_token(manager, token="test_token", expires_in=3600):
+    """Give a manager an access token expiring in expires_in seconds"""
+    manager.access_token = token
+    manager.expires_at = datetime.now() + timedelta(seconds=expires_in)
+
+
+@pytest.fixture
+def manager():
+    """Fresh OAuthTokenManager against a test token endpoint"""
+    return OAuthTokenManager(**MANAGER_KWARGS)
+
+
+@pytest.fixture
+def vinted_manager():
+    """Fresh VintedOAuthManager with test client credentials"""
+    return VintedOAuthManager(**CLIENT_KWARGS)
+
+
 class TestOAuthTokenManager:
     
-    def test_init(self):
+    def test_init(self, manager):
         """Test OAuthTokenManager initialization"""
-        manager = OAuthTokenManager(
-            client_id="test_client_id",
-            client_secret="test_client_secret",
-            token_endpoint="https://example.com/oauth/token"
-        )
-        
         assert manager.client_id == "test_client_id"
         assert manager.client_secret == "test_client_secret"
-        assert manager.token_endpoint == "https://example.com/oauth/token"
+        assert manager.token_endpoint == TOKEN_URL
         assert manager.access_token is None
         assert manager.refresh_token is None
         assert manager.expires_at is None
     
-    def test_initialize_tokens(self):
+    def test_initialize_tokens(self, manager):
         """Test token initialization"""
-        manager = OAuthTokenManager(
-            client_id="test_client_id",
-            client_secret="test_client_secret",
-            token_endpoint="https://example.com/oauth/token"
-        )
-        
         manager.initialize_tokens(
             access_token="test_access_token",
             refresh_token="test_refresh_token",
@@ -41,73 +63,56 @@ class TestOAuthTokenManager:
         assert manager.expires_at is not None
         assert manager.expires_at > datetime.now()
     
-    def test_is_token_valid(self):
+    @pytest.mark.parametrize("access_token,expires_delta,expected", [
+        (None, None, False),  # No token
+        ("test_token", timedelta(hours=1), True),
+        ("test_token", timedelta(hours=-1), False),  # Expired
+        ("test_token", None, True),  # No expiry, assume valid
+    ])
+    def test_is_token_valid(self, manager, access_token, expires_delta, expected):
         """Test token validity check"""
-        manager = OAuthTokenManager(
-            client_id="test_client_id",
-            client_secret="test_client_secret",
-            token_endpoint="https://example.com/oauth/token"
-        )
-        
-        # No token
-        assert manager.is_token_valid() is False
-        
-        # Valid token
-        manager.access_token = "test_token"
-        manager.expires_at = datetime.now() + timedelta(hours=1)
-        assert manager.is_token_valid() is True
-        
-        # Expired token
-        manager.expires_at = datetime.now() - timedelta(hours=1)
-        assert manager.is_token_valid() is False
-        
-        # Token without expiry (assume valid)
-        manager.expires_at = None
-        assert manager.is_token_valid() is True
+        manager.access_token = access_token
+        manager.expires_at = datetime.now() + expires_delta if expires_delta else None
+        assert manager.is_token_valid() is expected
     
-    def test_should_refresh_token(self):
+    @pytest.mark.parametrize("refresh_token,expires_delta,expected", [
+        (None, None, False),  # No refresh token
+        (None, timedelta(minutes=2), False),
+        ("test_refresh_token", None, False),  # No expiry
+        ("test_refresh_token", timedelta(minutes=10), False),  # More than 5 minutes left
+        ("test_refresh_token", timedelta(minutes=2), True),  # Less than 5 minutes left
+    ])
+    def test_should_refresh_token(self, manager, refresh_token, expires_delta, expected):
         """Test token refresh logic"""
-        manager = OAuthTokenManager(
-            client_id="test_client_id",
-            client_secret="test_client_secret",
-            token_endpoint="https://example.com/oauth/token"
-        )
-        
-        # No refresh token
-        assert manager._should_refresh_token() is False
-        
-        # Set up tokens
+        manager.refresh_token = refresh_token
+        manager.expires_at = datetime.now() + expires_delta if expires_delta else None
+        assert manager._should_refresh_token() is expected
+    
+    @pytest.mark.parametrize("seconds_left,expected", [
+        (301, False),
+        (300, True),  # Threshold is inclusive
+        (299, True),
+        (0, True),
+        (-1, True),  # Already expired
+    ])
+    def test_should_refresh_token_threshold(self, manager, seconds_left, expected):
+        """Test refresh decisions around the 5-minute threshold"""
         manager.refresh_token = "test_refresh_token"
-        manager.expires_at = datetime.now() + timedelta(minutes=10)  # 10 minutes left
-        
-        # Should not refresh (more than 5 minutes left)
-        assert manager._should_refresh_token() is False
+        manager.expires_at = datetime.now() + timedelta(seconds=seconds_left)
         
-        # Should refresh (less than 5 minutes left)
-        manager.expires_at = datetime.now() + timedelta(minutes=2)  # 2 minutes left
-        assert manager._should_refresh_token() is True
+        assert manager._should_refresh_token() is expected
     
-    @patch('src.utils.oauth_manager.requests.post')
-    def test_refresh_access_token_success(self, mock_post):
+    def test_refresh_access_token_success(self, http_mock, manager):
         """Test successful token refresh"""
-        manager = OAuthTokenManager(
-            client_id="test_client_id",
-            client_secret="test_client_secret",
-            token_endpoint="https://example.com/oauth/token"
-        )
-        
         manager.refresh_token = "test_refresh_token"
         
         # Mock successful response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        http_mock.post(TOKEN_URL, json={
             'access_token': 'new_access_token',
             'refresh_token': 'new_refresh_token',
             'token_type': 'Bearer',
             'expires_in': 3600
-        }
-        mock_post.return_value = mock_response
+        }, status_code=200)
         
         manager._refresh_access_token()
         
@@ -116,84 +121,95 @@ class TestOAuthTokenManager:
         assert manager.token_type == "Bearer"
         assert manager.expires_at is not None
     
-    @patch('src.utils.oauth_manager.requests.post')
-    def test_refresh_access_token_failure(self, mock_post):
-        """Test failed token refresh"""
-        manager = OAuthTokenManager(
-            client_id="test_client_id",
-            client_secret="test_client_secret",
-            token_endpoint="https://example.com/oauth/token"
-        )
+    def test_refresh_reuses_pooled_session(self, http_mock, manager):
+        """Test that repeated refreshes go through the same pooled session"""
+        manager.refresh_token = "test_refresh_token"
+        token_route = http_mock.post(TOKEN_URL, json={
+            'access_token': 'new_access_token',
+            'expires_in': 3600
+        }, status_code=200)
+        session = manager._session
         
+        with patch.object(session, 'post', wraps=session.post) as session_post:
+            manager._refresh_access_token()
+            manager._refresh_access_token()
+        
+        assert manager._session is session
+        assert session_post.call_count == 2
+        assert token_route.call_count == 2
+    
+    def test_refresh_access_token_failure(self, http_mock, manager):
+        """Test failed token refresh"""
         manager.refresh_token = "test_refresh_token"
         
         # Mock failed response
-        mock_response = Mock()
-        mock_response.status_code = 400
-        mock_response.text = "Invalid refresh token"
-        mock_post.return_value = mock_response
+        http_mock.post(TOKEN_URL, text="Invalid refresh token", status_code=400)
         
         with pytest.raises(Exception) as exc_info:
             manager._refresh_access_token()
         
         assert "Token refresh failed" in str(exc_info.value)
     
-    def test_get_valid_access_token(self):
+    def test_get_valid_access_token(self, manager):
         """Test getting valid access token"""
-        manager = OAuthTokenManager(
-            client_id="test_client_id",
-            client_secret="test_client_secret",
-            token_endpoint="https://example.com/oauth/token"
-        )
-        
         # No token
         token = manager.get_valid_access_token()
         assert token is None
         
         # Valid token
-        manager.access_token = "test_token"
-        manager.expires_at = datetime.now() + timedelta(hours=1)
+        prime_token(manager)
         token = manager.get_valid_access_token()
         assert token == "test_token"
     
-    def test_get_authorization_header(self):
-        """Test getting authorization header"""
-        manager = OAuthTokenManager(
-            client_id="test_client_id",
-            client_secret="test_client_secret",
-            token_endpoint="https://example.com/oauth/token"
-        )
+    def test_get_valid_access_token_is_cached(self, http_mock, manager):
+        """Test that a live token is returned without contacting the token endpoint"""
+        prime_token(manager)
+        manager.refresh_token = "test_refresh_token"
+        token_route = http_mock.post(TOKEN_URL, json={'access_token': 'new_access_token'}, status_code=200)
+        
+        tokens = {manager.get_valid_access_token() for _ in range(1000)}
+        
+        assert tokens == {"test_token"}
+        assert token_route.call_count == 0
+    
+    def test_concurrent_refresh_single_request(self, http_mock, manager):
+        """Test that concurrent callers share a single token refresh"""
+        prime_token(manager, "old_token", expires_in=60)
+        manager.refresh_token = "test_refresh_token"
+        
+        def slow_token(request, context):
+            time.sleep(0.05)
+            return {
+                'access_token': 'new_access_token',
+                'expires_in': 3600
+            }
         
-        manager.access_token = "test_token"
-        manager.expires_at = datetime.now() + timedelta(hours=1)
+        token_route = http_mock.post(TOKEN_URL, json=slow_token, status_code=200)
+        
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            tokens = list(executor.map(lambda _: manager.get_valid_access_token(), range(5)))
+        
+        assert tokens == ["new_access_token"] * 5
+        assert token_route.call_count == 1
+    
+    def test_get_authorization_header(self, manager):
+        """Test getting authorization header"""
+        prime_token(manager)
         
         header = manager.get_authorization_header()
         assert header == {'Authorization': 'Bearer test_token'}
     
-    def test_get_authorization_header_no_token(self):
+    def test_get_authorization_header_no_token(self, manager):
         """Test getting authorization header without token"""
-        manager = OAuthTokenManager(
-            client_id="test_client_id",
-            client_secret="test_client_secret",
-            token_endpoint="https://example.com/oauth/token"
-        )
-        
         with pytest.raises(Exception) as exc_info:
             manager.get_authorization_header()
         
         assert "No valid access token available" in str(exc_info.value)
     
-    def test_get_token_info(self):
+    def test_get_token_info(self, manager):
         """Test getting token information"""
-        manager = OAuthTokenManager(
-            client_id="test_client_id",
-            client_secret="test_client_secret",
-            token_endpoint="https://example.com/oauth/token"
-        )
-        
-        manager.access_token = "test_token"
+        prime_token(manager)
         manager.refresh_token = "test_refresh_token"
-        manager.expires_at = datetime.now() + timedelta(hours=1)
         
         info = manager.get_token_info()
         
@@ -207,119 +223,97 @@ class TestOAuthTokenManager:
 
 class TestVintedOAuthManager:
     
-    def test_init(self):
+    def test_init(self, vinted_manager):
         """Test VintedOAuthManager initialization"""
-        manager = VintedOAuthManager(
-            client_id="test_client_id",
-            client_secret="test_client_secret"
-        )
-        
-        assert manager.client_id == "test_client_id"
-        assert manager.client_secret == "test_client_secret"
-        assert manager.token_endpoint == "https://www.vinted.com/oauth/token"
-        assert manager.scope == ['read', 'write']
-        assert manager.redirect_uri == 'http://localhost:8080/callback'
+        assert vinted_manager.client_id == "test_client_id"
+        assert vinted_manager.client_secret == "test_client_secret"
+        assert vinted_manager.token_endpoint == VINTED_TOKEN_URL
+        assert vinted_manager.scope == ['read', 'write']
+        assert vinted_manager.redirect_uri == 'http://localhost:8080/callback'
     
-    def test_get_authorization_url(self):
+    def test_get_authorization_url(self, vinted_manager):
         """Test getting authorization URL"""
-        manager = VintedOAuthManager(
-            client_id="test_client_id",
-            client_secret="test_client_secret"
-        )
-        
-        auth_url = manager.get_authorization_url()
-        
-        assert "https://www.vinted.com/oauth/authorize" in auth_url
-        assert "client_id=test_client_id" in auth_url
-        assert "response_type=code" in auth_url
-        assert "scope=read write" in auth_url or "scope=read+write" in auth_url or "scope=read%20write" in auth_url
+        parsed = urlparse(vinted_manager.get_authorization_url())
+        query = parse_qs(parsed.query)
+        
+        assert f"{parsed.scheme}://{parsed.netloc}{parsed.path}" == "https://www.vinted.com/oauth/authorize"
+        assert query["client_id"] == ["test_client_id"]
+        assert query["response_type"] == ["code"]
+        assert query["scope"] == ["read write"]
+        assert "state" not in query
     
-    def test_get_authorization_url_with_state(self):
+    def test_get_authorization_url_with_state(self, vinted_manager):
         """Test getting authorization URL with state"""
-        manager = VintedOAuthManager(
-            client_id="test_client_id",
-            client_secret="test_client_secret"
-        )
+        auth_url = vinted_manager.get_authorization_url(state="test_state")
         
-        auth_url = manager.get_authorization_url(state="test_state")
+        assert parse_qs(urlparse(auth_url).query)["state"] == ["test_state"]
+    
+    def test_get_authorization_url_encodes_redirect_uri(self, vinted_manager):
+        """Test that query parameters are URL-encoded"""
+        auth_url = vinted_manager.get_authorization_url(state="a&b")
         
-        assert "state=test_state" in auth_url
+        assert "redirect_uri=http%3A%2F%2Flocalhost%3A8080%2Fcallback" in auth_url
+        assert "scope=read%20write" in auth_url
+        assert "state=a%26b" in auth_url
     
-    @patch('src.utils.oauth_manager.requests.post')
-    def test_exchange_code_for_tokens_success(self, mock_post):
+    def test_exchange_code_for_tokens_success(self, http_mock, vinted_manager):
         """Test successful code exchange"""
-        manager = VintedOAuthManager(
-            client_id="test_client_id",
-            client_secret="test_client_secret"
-        )
-        
         # Mock successful response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        http_mock.post(VINTED_TOKEN_URL, json={
             'access_token': 'access_token_123',
             'refresh_token': 'refresh_token_123',
             'token_type': 'Bearer',
             'expires_in': 3600
-        }
-        mock_post.return_value = mock_response
+        }, status_code=200)
         
-        token_data = manager.exchange_code_for_tokens("authorization_code_123")
+        token_data = vinted_manager.exchange_code_for_tokens("authorization_code_123")
         
         assert token_data['access_token'] == 'access_token_123'
-        assert manager.access_token == 'access_token_123'
-        assert manager.refresh_token == 'refresh_token_123'
+        assert vinted_manager.access_token == 'access_token_123'
+        assert vinted_manager.refresh_token == 'refresh_token_123'
     
-    @patch('src.utils.oauth_manager.requests.post')
-    def test_exchange_code_for_tokens_failure(self, mock_post):
+    def test_exchange_code_for_tokens_failure(self, http_mock, vinted_manager):
         """Test failed code exchange"""
-        manager = VintedOAuthManager(
-            client_id="test_client_id",
-            client_secret="test_client_secret"
-        )
-        
         # Mock failed response
-        mock_response = Mock()
-        mock_response.status_code = 400
-        mock_response.text = "Invalid authorization code"
-        mock_post.return_value = mock_response
+        http_mock.post(VINTED_TOKEN_URL, text="Invalid authorization code", status_code=400)
         
         with pytest.raises(Exception) as exc_info:
-            manager.exchange_code_for_tokens("invalid_code")
+            vinted_manager.exchange_code_for_tokens("invalid_code")
         
         assert "Token exchange failed" in str(exc_info.value)
     
     def test_validate_webhook_signature(self):
         """Test webhook signature validation"""
-        manager = VintedOAuthManager(
-            client_id="test_client_id",
-            client_secret="test_secret"
-        )
-        
-        payload = "test_payload"
-        # Calculate the actual expected signature for the payload and secret
-        import hmac
-        import hashlib
-        expected_signature = hmac.new(
-            "test_secret".encode(),
-            payload.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        manager = VintedOAuthManager(**{**CLIENT_KWARGS, "client_secret": "test_secret"})
         
         # Test with correct signature
-        is_valid = manager.validate_webhook_signature(payload, expected_signature)
+        is_valid = manager.validate_webhook_signature(WEBHOOK_PAYLOAD.decode(), WEBHOOK_SIGNATURE)
         assert is_valid is True
         
         # Test with incorrect signature
-        is_valid = manager.validate_webhook_signature(payload, "invalid_signature")
+        is_valid = manager.validate_webhook_signature(WEBHOOK_PAYLOAD.decode(), "invalid_signature")
         assert is_valid is False
+        
+        # Raw bytes payloads are accepted as-is
+        is_valid = manager.validate_webhook_signature(WEBHOOK_PAYLOAD, WEBHOOK_SIGNATURE)
+        assert is_valid is True
+    
+    @pytest.mark.parametrize("signature", [
+        WEBHOOK_SIGNATURE[:-1] + ("0" if WEBHOOK_SIGNATURE[-1] != "0" else "1"),  # Last char differs
+        WEBHOOK_SIGNATURE[:-1],  # Truncated
+        WEBHOOK_SIGNATURE.upper(),
+        "é" * len(WEBHOOK_SIGNATURE),  # Non-ASCII
+        "",
+    ])
+    def test_validate_webhook_signature_near_miss(self, signature):
+        """Test that signatures differing from the expected one are rejected"""
+        manager = VintedOAuthManager(**{**CLIENT_KWARGS, "client_secret": "test_secret"})
+        
+        assert manager.validate_webhook_signature(WEBHOOK_PAYLOAD, signature) is False
     
     def test_validate_webhook_signature_no_secret(self):
         """Test webhook signature validation without secret"""
-        manager = VintedOAuthManager(
-            client_id="test_client_id",
-            client_secret=None
-        )
+        manager = VintedOAuthManager(**{**CLIENT_KWARGS, "client_secret": None})
         
         is_valid = manager.validate_webhook_signature("payload", "signature")
         assert is_valid is False
\ No newline at end of file
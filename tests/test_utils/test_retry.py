@@ -0,0 +1,512 @@
+import pytest
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, patch
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+import requests
+
+from src.utils.retry import (
+    RetryConfig, retry_on_failure, async_retry_on_failure, parse_retry_after,
+    calculate_backoff, calculate_response_backoff, CircuitBreaker, CircuitState,
+    with_timeout, with_deadline, cached_with_retry, TIMEOUT_MAX_WORKERS
+)
+import src.utils.retry as retry_module
+
+
+class TestRetryAfter:
+    
+    def test_parse_retry_after_seconds(self):
+        """Test parsing Retry-After given in seconds"""
+        assert parse_retry_after("120") == 120.0
+        assert parse_retry_after("-5") == 0.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("not a date") is None
+    
+    def test_parse_retry_after_http_date(self):
+        """Test parsing Retry-After given as an HTTP-date"""
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+        
+        delay = parse_retry_after(format_datetime(retry_at, usegmt=True))
+        
+        assert 28 <= delay <= 30
+    
+    def test_429_uses_server_delay(self, make_response):
+        """Test that 429 responses sleep exactly what the server asked for"""
+        config = RetryConfig(backoff_factor=2, jitter=False)
+        response = make_response(429, headers={"Retry-After": "0.5"})
+        
+        assert calculate_response_backoff(response, 3, config) == 0.5
+    
+    def test_503_uses_larger_of_hint_and_backoff(self, make_response):
+        """Test that other statuses never retry sooner than the server asked"""
+        config = RetryConfig(backoff_factor=2, jitter=False, max_backoff=10)
+        
+        assert calculate_response_backoff(make_response(503, headers={"Retry-After": "5"}), 0, config) == 5
+        assert calculate_response_backoff(make_response(503, headers={"Retry-After": "1"}), 2, config) == 4
+        assert calculate_response_backoff(make_response(503, headers={"Retry-After": "60"}), 0, config) == 10
+    
+    @patch('src.utils.retry.time.sleep')
+    def test_retry_on_failure_sleeps_retry_after(self, mock_sleep, make_response):
+        """Test that the decorator sleeps for the Retry-After delay"""
+        responses = [make_response(429, headers={"Retry-After": "7"}), make_response(200)]
+        
+        @retry_on_failure(RetryConfig(max_retries=2))
+        def call():
+            return responses.pop(0)
+        
+        result = call()
+        
+        assert result.status_code == 200
+        mock_sleep.assert_called_once_with(7.0)
+
+
+class TestCalculateBackoff:
+    
+    def test_no_jitter(self):
+        """Test plain capped exponential backoff"""
+        config = RetryConfig(backoff_factor=2, max_backoff=10, jitter=False)
+        
+        assert [calculate_backoff(attempt, config) for attempt in range(5)] == [1, 2, 4, 8, 10]
+        assert calculate_backoff(7, config) == 10
+    
+    def test_reflects_updated_settings(self):
+        """Test that changing backoff settings after construction updates the delays"""
+        config = RetryConfig(max_retries=1, backoff_factor=2, max_backoff=10, jitter=False)
+        config.max_retries = 4
+        config.backoff_factor = 3
+        config.max_backoff = 20
+        
+        assert [calculate_backoff(attempt, config) for attempt in range(5)] == [1, 3, 9, 20, 20]
+    
+    @pytest.mark.parametrize("strategy,lower", [("full", 0), ("equal", 4)])
+    def test_jitter_bounds(self, strategy, lower):
+        """Test that full and equal jitter stay within their ranges"""
+        config = RetryConfig(backoff_factor=2, jitter_strategy=strategy)
+        
+        for _ in range(100):
+            assert lower <= calculate_backoff(3, config) <= 8
+    
+    def test_decorrelated_jitter(self):
+        """Test that decorrelated jitter grows from the previous sleep"""
+        config = RetryConfig(backoff_factor=2, max_backoff=30, jitter_strategy="decorrelated")
+        
+        for _ in range(100):
+            assert 2 <= calculate_backoff(1, config, previous_backoff=5) <= 15
+            assert calculate_backoff(1, config, previous_backoff=50) <= 30
+    
+    def test_unknown_strategy(self):
+        """Test that unknown jitter strategies are rejected"""
+        with pytest.raises(ValueError):
+            RetryConfig(jitter_strategy="random")
+
+
+class TestRetryDecorators:
+    
+    @patch('src.utils.retry.time.sleep')
+    def test_retries_on_connection_error(self, mock_sleep):
+        """Test that retryable exceptions are retried until success"""
+        calls = []
+        
+        @retry_on_failure(RetryConfig(max_retries=3))
+        def call():
+            calls.append(1)
+            if len(calls) < 3:
+                raise requests.exceptions.ConnectionError("connection reset")
+            return "ok"
+        
+        assert call() == "ok"
+        assert len(calls) == 3
+        assert mock_sleep.call_count == 2
+    
+    @patch('src.utils.retry._retry_steps')
+    def test_success_skips_retry_machinery(self, mock_steps, make_response):
+        """Test that a first-attempt success never builds the retry policy"""
+        @retry_on_failure()
+        def call():
+            return make_response(200)
+        
+        assert call().status_code == 200
+        mock_steps.assert_not_called()
+    
+    @patch('src.utils.retry.time.sleep')
+    def test_retry_warning_uses_lazy_args(self, mock_sleep, caplog, make_response):
+        """Test that retry warnings defer formatting to the logging record"""
+        responses = [make_response(503), make_response(200)]
+        
+        @retry_on_failure(RetryConfig(max_retries=1, jitter=False))
+        def call():
+            return responses.pop(0)
+        
+        with caplog.at_level("WARNING", logger=__name__):
+            call()
+        
+        record = caplog.records[0]
+        assert record.args == (503, "call", 1.0, 1, 2)
+        assert record.getMessage() == "HTTP 503 error in call, retrying in 1.00s (attempt 1/2)"
+    
+    @patch('src.utils.retry.time.sleep')
+    def test_non_retryable_exception_raises(self, mock_sleep):
+        """Test that other exceptions propagate immediately"""
+        @retry_on_failure(RetryConfig(max_retries=3))
+        def call():
+            raise ValueError("bad input")
+        
+        with pytest.raises(ValueError):
+            call()
+        
+        mock_sleep.assert_not_called()
+    
+    @patch('src.utils.retry.time.sleep')
+    def test_returns_last_response_after_max_retries(self, mock_sleep, make_response):
+        """Test that the final error response is returned once retries run out"""
+        @retry_on_failure(RetryConfig(max_retries=2))
+        def call():
+            return make_response(503)
+        
+        assert call().status_code == 503
+        assert mock_sleep.call_count == 2
+    
+    @patch('src.utils.retry.time.sleep')
+    def test_non_idempotent_post_not_retried_on_5xx(self, mock_sleep, make_response):
+        """Test that a non-idempotent POST stops on 5xx but still retries 429"""
+        config = RetryConfig(max_retries=2, idempotent=False,
+                             method_getter=lambda args, kwargs: args[0])
+        statuses = {"POST": [503], "GET": [503, 200], "PATCH": [429, 201]}
+        
+        @retry_on_failure(config)
+        def call(method):
+            return make_response(statuses[method].pop(0))
+        
+        assert call("POST").status_code == 503
+        mock_sleep.assert_not_called()
+        
+        assert call("GET").status_code == 200
+        assert call("PATCH").status_code == 201
+        assert mock_sleep.call_count == 2
+    
+    @patch('src.utils.retry.time.sleep')
+    def test_non_idempotent_call_not_retried_on_exception(self, mock_sleep):
+        """Test that a non-idempotent call re-raises a timeout without retrying"""
+        calls = []
+        
+        @retry_on_failure(RetryConfig(max_retries=2, idempotent=False))
+        def create():
+            calls.append(1)
+            raise requests.exceptions.Timeout("read timed out")
+        
+        with pytest.raises(requests.exceptions.Timeout):
+            create()
+        
+        assert len(calls) == 1
+        mock_sleep.assert_not_called()
+    
+    @patch('src.utils.retry.time.sleep')
+    def test_reraise_keeps_original_traceback(self, mock_sleep):
+        """Test that a re-raised exception gains no extra wrapper frames"""
+        @retry_on_failure(RetryConfig(max_retries=1))
+        def call():
+            raise requests.exceptions.ConnectionError("refused")
+        
+        with pytest.raises(requests.exceptions.ConnectionError) as exc_info:
+            call()
+        
+        frames = [entry.name for entry in exc_info.traceback]
+        assert frames[-2:] == ["wrapper", "call"]
+        assert frames.count("wrapper") == 1
+        assert mock_sleep.call_count == 1
+    
+    def test_config_has_no_instance_dict(self):
+        """Test that RetryConfig stores its fields in slots"""
+        config = RetryConfig()
+        
+        assert not hasattr(config, '__dict__')
+        with pytest.raises(AttributeError):
+            config.unknown_option = True
+    
+    def test_split_statuses(self):
+        """Test that retry statuses split into immediate and backoff sets"""
+        config = RetryConfig()
+        
+        assert config.immediate_retry_statuses == {429}
+        assert config.backoff_statuses == {500, 502, 503, 504}
+    
+    @patch('src.utils.retry.time.sleep')
+    def test_non_idempotent_retries_only_immediate_statuses(self, mock_sleep, make_response):
+        """Test that non-idempotent calls stop on backoff statuses only"""
+        config = RetryConfig(max_retries=2, idempotent=False, immediate_retry_statuses=[429, 503])
+        responses = [make_response(503), make_response(500)]
+        
+        @retry_on_failure(config)
+        def create():
+            return responses.pop(0)
+        
+        assert create().status_code == 500
+        assert mock_sleep.call_count == 1
+    
+    @patch('src.utils.retry.asyncio.sleep', new_callable=AsyncMock)
+    def test_async_retry(self, mock_sleep):
+        """Test that the async decorator shares the same retry policy"""
+        calls = []
+        
+        @async_retry_on_failure(RetryConfig(max_retries=2))
+        async def call():
+            calls.append(1)
+            if len(calls) < 2:
+                raise requests.exceptions.Timeout("timed out")
+            return "ok"
+        
+        assert asyncio.run(call()) == "ok"
+        assert len(calls) == 2
+        mock_sleep.assert_awaited_once()
+
+
+class TestCachedWithRetry:
+    
+    def test_returns_cached_result_within_ttl(self, make_response):
+        """Test that repeated calls within the TTL are served from cache"""
+        calls = []
+        
+        @cached_with_retry(ttl_seconds=30)
+        def fetch(item_id, page=1):
+            calls.append((item_id, page))
+            return make_response(200)
+        
+        first = fetch("item1", page=2)
+        
+        assert fetch("item1", page=2) is first
+        assert fetch("item2") is not first
+        assert calls == [("item1", 2), ("item2", 1)]
+    
+    def test_cache_size_is_bounded(self, make_response):
+        """Test that the least recently used entries are evicted past maxsize"""
+        calls = []
+        
+        @cached_with_retry(ttl_seconds=30, maxsize=2)
+        def fetch(item_id):
+            calls.append(item_id)
+            return make_response(200)
+        
+        fetch("item1")
+        fetch("item2")
+        fetch("item1")  # Refresh item1 so item2 is least recently used
+        for item_id in ("item3", "item4", "item5"):
+            fetch(item_id)
+        
+        assert fetch.cache_size() == 2
+        
+        fetch("item5")
+        fetch("item1")
+        assert calls == ["item1", "item2", "item3", "item4", "item5", "item1"]
+    
+    def test_serves_stale_result_when_rate_limited(self, make_response):
+        """Test that a 429 extends the cached entry by Retry-After instead of retrying"""
+        now = [100.0]
+        responses = [make_response(200), make_response(429, headers={"Retry-After": "60"})]
+        
+        @cached_with_retry(ttl_seconds=10, clock=lambda: now[0])
+        def fetch():
+            return responses.pop(0)
+        
+        first = fetch()
+        now[0] = 120.0
+        
+        assert fetch() is first
+        assert responses == []
+        
+        now[0] = 170.0
+        assert fetch() is first
+    
+    @patch('src.utils.retry.time.sleep')
+    def test_error_responses_not_cached(self, mock_sleep, make_response):
+        """Test that error responses are retried and never cached"""
+        responses = [make_response(503), make_response(200)]
+        
+        @cached_with_retry(ttl_seconds=30, config=RetryConfig(max_retries=1))
+        def fetch():
+            return responses.pop(0)
+        
+        assert fetch().status_code == 200
+        assert fetch().status_code == 200
+        assert mock_sleep.call_count == 1
+        
+        fetch.cache_clear()
+        with pytest.raises(IndexError):
+            fetch()
+
+
+class TestCircuitBreaker:
+    
+    def test_opens_after_threshold(self):
+        """Test that the breaker opens and rejects calls after repeated failures"""
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60.0)
+        
+        @breaker
+        def call():
+            raise ValueError("boom")
+        
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                call()
+        
+        assert breaker.state == CircuitState.OPEN
+        with pytest.raises(Exception, match="Circuit breaker is OPEN"):
+            call()
+    
+    def test_recovers_using_monotonic_clock(self):
+        """Test that recovery is timed with the monotonic clock"""
+        now = [100.0]
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30.0)
+        breaker._monotonic = lambda: now[0]
+        outcomes = [ValueError("boom"), "ok"]
+        
+        @breaker
+        def call():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        
+        with pytest.raises(ValueError):
+            call()
+        assert breaker.state == CircuitState.OPEN
+        
+        now[0] += 30.0
+        assert call() == "ok"
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.failure_count == 0
+    
+    def test_single_probe_while_half_open(self):
+        """Test that only one caller probes once the recovery window passes"""
+        now = [100.0]
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30.0)
+        breaker._monotonic = lambda: now[0]
+        breaker._on_failure()
+        
+        now[0] += 30.0
+        assert breaker.try_acquire() is True
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.try_acquire() is False
+        
+        breaker._on_success()
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.try_acquire() is True
+    
+    def test_failed_probe_doubles_recovery_window(self):
+        """Test that each failed probe backs off the next one"""
+        now = [100.0]
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30.0, max_recovery_timeout=100.0)
+        breaker._monotonic = lambda: now[0]
+        breaker._on_failure()
+        
+        for expected_window in (60.0, 100.0, 100.0):
+            now[0] += breaker._open_timeout
+            assert breaker.try_acquire() is True
+            breaker._on_failure()
+            
+            assert breaker.state == CircuitState.OPEN
+            assert breaker._open_timeout == expected_window
+            now[0] += expected_window - 1
+            assert breaker.try_acquire() is False
+            now[0] -= expected_window - 1
+    
+    def test_unexpected_exception_releases_probe(self):
+        """Test that a probe failing with an unexpected exception frees the slot"""
+        breaker = CircuitBreaker(failure_threshold=1, expected_exception=ValueError)
+        breaker.state = CircuitState.OPEN
+        
+        @breaker
+        def call():
+            raise KeyError("unexpected")
+        
+        with pytest.raises(KeyError):
+            call()
+        
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.try_acquire() is True
+    
+    def test_concurrent_failures_open_once(self):
+        """Test that concurrent failures are all counted and open the breaker once"""
+        breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=60.0)
+        barrier = threading.Barrier(8)
+        
+        def fail():
+            barrier.wait()
+            breaker._on_failure()
+        
+        threads = [threading.Thread(target=fail) for _ in range(8)]
+        with patch.object(breaker.logger, 'warning') as mock_warning:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        assert breaker.failure_count == 8
+        assert breaker.state == CircuitState.OPEN
+        mock_warning.assert_called_once()
+        assert breaker.try_acquire() is False
+
+
+class TestTimeouts:
+    
+    def test_with_timeout_returns_result(self):
+        """Test that a fast call returns its result"""
+        @with_timeout(1.0)
+        def call(value):
+            return value * 2
+        
+        assert call(21) == 42
+    
+    def test_with_timeout_raises_on_slow_call(self):
+        """Test that a slow call raises TimeoutError with a fractional timeout"""
+        @with_timeout(0.05)
+        def call():
+            time.sleep(0.5)
+        
+        with pytest.raises(TimeoutError, match="timed out after 0.05 seconds"):
+            call()
+    
+    def test_with_timeout_from_worker_thread(self):
+        """Test that the decorator works outside the main thread"""
+        @with_timeout(1.0)
+        def call():
+            return "ok"
+        
+        results = []
+        thread = threading.Thread(target=lambda: results.append(call()))
+        thread.start()
+        thread.join()
+        
+        assert results == ["ok"]
+    
+    @pytest.mark.parametrize("timeout_seconds", [0, -1, None])
+    def test_with_timeout_disabled(self, timeout_seconds):
+        """Test that a non-positive timeout runs the call directly with no limit"""
+        @with_timeout(timeout_seconds)
+        def call():
+            time.sleep(0.01)
+            return threading.current_thread()
+        
+        assert call() is threading.current_thread()
+    
+    def test_timeout_executor_is_bounded(self):
+        """Test that the shared executor has an explicit worker limit"""
+        @with_timeout(1.0)
+        def call():
+            return "ok"
+        
+        call()
+        
+        assert retry_module._timeout_executor._max_workers == TIMEOUT_MAX_WORKERS
+    
+    def test_with_deadline_passes_deadline(self):
+        """Test that the deadline kwarg is a monotonic timestamp"""
+        @with_deadline(5.0)
+        def call(deadline):
+            return deadline
+        
+        start = time.monotonic()
+        deadline = call()
+        
+        assert start + 5.0 <= deadline <= time.monotonic() + 5.0